@@ -1,70 +1,188 @@
 import streamlit as st
-from scraper.google_maps_scraper import GoogleMapsScraper
+from scraper.cache import PlaceCache
+from scraper.checkpoint import Checkpoint
+from scraper.classifier import COUNTRY_RULES, DEFAULT_COUNTRY
+from scraper.driver_pool import DriverPool
+from scraper.google_maps_scraper import create_chrome_driver
+from scraper.jobs import JobQueue, JobQueueFull
+from scraper.pacing import WaitScheduler
+from scraper.sinks import read_records
 import pandas as pd
-from io import StringIO
+import hashlib
+import json
+import os
 import sys
-import traceback
-
-# Function to run the scraper and return results as CSV string
-def run_scraper(query, max_results, max_pages, progress_bar, status_text):
-    try:
-        status_text.text("Initializing Chrome driver...")
-        scraper = GoogleMapsScraper()
-        status_text.text("Starting scraping...")
-        csv_string = scraper.scrape(query, max_results, max_pages, progress_callback=lambda msg: status_text.text(msg))
-        return csv_string, None
-    except Exception as e:
-        error_msg = f"Error during scraping: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
-        return None, error_msg
+import time
+
+# Seconds between page refreshes while one of the session's jobs is still running
+REFRESH_SECONDS = 1.0
+
+# Shared pool of warm Chrome drivers, created once per server process
+@st.cache_resource
+def get_driver_pool():
+    pool = DriverPool(
+        size=int(os.environ.get('SCRAPER_POOL_SIZE', 2)),
+        max_pages_per_driver=int(os.environ.get('SCRAPER_POOL_MAX_PAGES', 200)),
+        driver_factory=create_chrome_driver,
+    )
+    return pool.start()
+
+# Places scraped by any session are reused until they expire
+@st.cache_resource
+def get_place_cache():
+    return PlaceCache(
+        path=os.environ.get('SCRAPER_CACHE_PATH', 'place_cache.sqlite3'),
+        ttl_seconds=int(os.environ.get('SCRAPER_CACHE_TTL', 7 * 24 * 3600)),
+    )
+
+# Scrapes run in the background on a fixed set of worker threads shared by every session,
+# so a rerun or a closed tab never blocks on or orphans a browser. One scheduler paces them
+# all, so concurrent jobs share its rate limit and wait timeouts adapt to every job's pages
+@st.cache_resource
+def get_job_queue():
+    return JobQueue(
+        get_driver_pool(),
+        workers=int(os.environ.get('SCRAPER_JOB_WORKERS', get_driver_pool().size)),
+        max_queued=int(os.environ.get('SCRAPER_JOB_QUEUE_SIZE', 20)),
+        export_dir=os.environ.get('SCRAPER_EXPORT_DIR', 'exports'),
+        cache=get_place_cache(),
+        pacing=WaitScheduler(),
+    ).start()
+
+# A finished job's records as a typed DataFrame, loaded once and shared by every session
+@st.cache_resource(max_entries=8)
+def load_results(path):
+    return read_records(path)
+
+# Each query journals to its own file so a crashed run or a rerun can pick up where it stopped
+def get_checkpoint(query, resume):
+    checkpoint_dir = os.environ.get('SCRAPER_CHECKPOINT_DIR', 'checkpoints')
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    name = hashlib.sha1(query.strip().lower().encode('utf-8')).hexdigest()[:16]
+    return Checkpoint(os.path.join(checkpoint_dir, f'{name}.jsonl'), resume=resume)
+
+# Where a scrape spent its time, per phase, with skip reasons and WebDriver command counts
+def show_timings(stats, prometheus_text, key=''):
+    with st.expander('Timing'):
+        st.write(f"{stats['records']} records from {stats['places_handled']} places in {stats['seconds']:.1f}s, "
+                 f"{stats['webdriver_commands']} WebDriver commands")
+        if stats['phases']:
+            phases = pd.DataFrame(stats['phases']).T.round(3)
+            phases['count'] = phases['count'].astype(int)
+            st.dataframe(phases)
+        if stats['skips']:
+            st.write('Skipped businesses:')
+            st.json(stats['skips'])
+        st.download_button(label='Download stats (JSON)', data=json.dumps(stats, indent=2, ensure_ascii=False),
+                           file_name='scrape_stats.json', mime='application/json', key=f'{key}-stats-json')
+        st.download_button(label='Download stats (Prometheus)', data=prometheus_text,
+                           file_name='scrape_stats.prom', mime='text/plain', key=f'{key}-stats-prom')
+
+# Status, progress and results of one background job
+def show_job(job_queue, job):
+    st.write(f"### {job.query}")
+    st.caption(f"Job {job.id}: {job.status}")
+    if job.active:
+        st.progress(job.progress)
+        position = job_queue.position(job)
+        if position is not None:
+            st.write(f"Waiting for a worker ({position} jobs ahead)")
+        elif job.last_event:
+            st.text(job.last_event)
+        st.metric('Businesses found', job.count)
+        if job.latest:
+            st.dataframe(pd.DataFrame(list(job.latest)))
+        if st.button('Cancel', key=f'{job.id}-cancel'):
+            job_queue.cancel(job.id)
+        return
+
+    if job.status == 'failed':
+        st.error(f"❌ {job.error}")
+    elif not job.count:
+        st.warning("⚠️ No data was scraped.")
+    else:
+        if job.status == 'cancelled':
+            st.info(f"Cancelled with {job.count} results.")
+        else:
+            st.success(f"✅ Scraping completed successfully! Found {job.count} results.")
+        st.dataframe(load_results(job.paths['csv']))
+
+        # Download links, read from the job's result files
+        formats = [('csv', 'Download CSV', 'text/csv'), ('jsonl', 'Download JSONL', 'application/x-ndjson'),
+                   ('parquet', 'Download Parquet', 'application/octet-stream')]
+        for fmt, label, mime in formats:
+            if fmt in job.paths and os.path.exists(job.paths[fmt]):
+                with open(job.paths[fmt], 'rb') as f:
+                    st.download_button(label=label, data=f, file_name=f'scraped_data.{fmt}', mime=mime,
+                                       key=f'{job.id}-{fmt}')
+    if job.stats:
+        show_timings(*job.stats, key=job.id)
 
 # Streamlit UI
 def main():
     st.title('Google Maps Business Scraper')
+    job_queue = get_job_queue()
 
     # Sidebar input fields
     query = st.text_input('Enter search query (e.g., Consultancies in Mumbai, Maharashtra, India):')
     max_results = st.number_input('Max results per category:', min_value=1, value=100)
     max_pages = st.number_input('Max pages to scrape:', min_value=1, value=5)
+    workers = st.number_input('Parallel detail workers:', min_value=1, max_value=get_driver_pool().size, value=1)
+    # Parallel jobs don't journal their places, so only a single-worker run can be resumed
+    resume = st.checkbox('Resume the previous run of this query', value=False, disabled=workers > 1,
+                         help='Continue from the saved checkpoint instead of starting over (single worker only)')
+    countries = sorted(COUNTRY_RULES)
+    country = st.selectbox('Phone number country:', countries, index=countries.index(DEFAULT_COUNTRY))
+    lean = st.checkbox('Lean mode', value=True,
+                       help="Don't load images, fonts, map tiles or analytics; they are not needed for the data")
+    http = st.checkbox('HTTP mode', value=False,
+                       help='Read the data Google Maps embeds in its pages without rendering them. Only covers the '
+                            'first page of results; falls back to the browser when a page cannot be read')
+    # Set by the server operator only; a path typed by a visitor would let them write anywhere on the server
+    sqlite_path = os.environ.get('SCRAPER_SQLITE_PATH') or None
+    if sqlite_path:
+        st.caption(f"Results are also appended to the server's SQLite database ({os.path.basename(sqlite_path)}).")
 
-    # Initialize session state to keep track of data
-    if 'csv_data' not in st.session_state:
-        st.session_state.csv_data = None
+    # Initialize session state to keep track of the jobs this session follows, newest first
+    if 'job_ids' not in st.session_state:
+        st.session_state.job_ids = []
 
-    # Scrape data when button is clicked
+    # Queue a scrape when button is clicked
     if st.button('Scrape Data'):
         if not query:
             st.error("Please enter a search query.")
             return
-        
-        progress_bar = st.progress(0)
-        status_text = st.empty()
-        
         try:
-            csv_string, error = run_scraper(query, max_results, max_pages, progress_bar, status_text)
-            
-            if error:
-                status_text.error(f"❌ {error}")
-                st.session_state.csv_data = None
-            elif csv_string:
-                progress_bar.progress(1.0)
-                status_text.success("✅ Scraping completed successfully!")
-                st.session_state.csv_data = csv_string  # Save data to session state
-            else:
-                status_text.warning("⚠️ No data was scraped.")
-                st.session_state.csv_data = None
-        except Exception as e:
-            status_text.error(f"❌ Unexpected error: {str(e)}\n\n{traceback.format_exc()}")
-            st.session_state.csv_data = None
-
-    # Display scraped data if available
-    if st.session_state.csv_data:
-        df = pd.read_csv(StringIO(st.session_state.csv_data))
-        st.write('### Scraped Data:')
-        st.dataframe(df)
-
-        # Download link for CSV
-        st.write('### Download CSV:')
-        st.download_button(label='Download CSV', data=st.session_state.csv_data, file_name='scraped_data.csv', mime='text/csv')
+            options = dict(lean=lean, country=country, http=http)
+            if workers == 1:
+                options['checkpoint'] = get_checkpoint(query, resume)
+            job = job_queue.submit(query, max_results, max_pages, workers=workers, sqlite_path=sqlite_path,
+                                   **options)
+            st.session_state.job_ids.insert(0, job.id)
+        except JobQueueFull as e:
+            st.error(f"❌ The server is busy: {e}")
+
+    # Jobs can be followed from any session by their ID
+    job_id = st.text_input('Open a job by ID:').strip()
+    if job_id and job_id not in st.session_state.job_ids:
+        if job_queue.get(job_id):
+            st.session_state.job_ids.insert(0, job_id)
+        else:
+            st.warning(f"No job with ID {job_id}")
+
+    jobs = [job for job in map(job_queue.get, st.session_state.job_ids) if job]
+    for job in jobs:
+        show_job(job_queue, job)
+
+    with st.expander('Driver pool stats'):
+        st.json(get_driver_pool().get_stats())
+    with st.expander('Job queue stats'):
+        st.json(job_queue.get_stats())
+
+    # Keep the progress of running jobs moving without blocking the script on the scrape
+    if any(job.active for job in jobs):
+        time.sleep(REFRESH_SECONDS)
+        st.rerun()
 
 if __name__ == '__main__':
     main()
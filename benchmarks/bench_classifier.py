@@ -0,0 +1,131 @@
+"""Micro-benchmark of the phone/address classifier against the original scraper methods.
+
+Run with ``python -m benchmarks.bench_classifier [rows]``.
+"""
+import gc
+import random
+import re
+import sys
+import time
+
+import pandas as pd  # noqa: F401  (imported up front so the vectorized timing excludes import cost)
+
+from scraper.classifier import PhoneClassifier
+
+
+# The methods as they were on GoogleMapsScraper before scraper.classifier existed, kept as the baseline.
+def legacy_is_valid_phone(text):
+    if not text or len(text) < 7:
+        return False
+    cleaned = re.sub(r'[\s\-\(\)\+]', '', text)
+    digit_count = sum(c.isdigit() for c in cleaned)
+    if digit_count < 7:
+        return False
+    has_plus = '+' in text
+    has_parentheses = '(' in text and ')' in text
+    has_digits = any(c.isdigit() for c in text)
+    return has_digits and (has_plus or has_parentheses or (digit_count >= 7 and digit_count <= 15))
+
+
+def legacy_is_mobile_phone(text):
+    if not text:
+        return False
+    cleaned = re.sub(r'[\s\-\(\)]', '', text)
+    if cleaned.startswith('+90'):
+        cleaned = cleaned[3:]
+    elif cleaned.startswith('0090'):
+        cleaned = cleaned[4:]
+    elif cleaned.startswith('90') and len(cleaned) > 10:
+        cleaned = cleaned[2:]
+    if cleaned.startswith('05'):
+        digits_only = re.sub(r'[^\d]', '', cleaned)
+        if len(digits_only) == 10 and digits_only.startswith('05'):
+            if len(digits_only) >= 3 and digits_only[2] in '0123456789':
+                return True
+    if text.startswith('+90') or text.startswith('0090'):
+        after_country = cleaned
+        if '+' in text:
+            parts = text.split('+90')
+            if len(parts) > 1:
+                after_country = re.sub(r'[\s\-\(\)]', '', parts[1])
+        digits_only = re.sub(r'[^\d]', '', after_country)
+        if len(digits_only) == 10 and digits_only.startswith('5'):
+            return True
+    return False
+
+
+def legacy_looks_like_address(text):
+    if not text:
+        return False
+    address_keywords = ['cad', 'sok', 'mah', 'no:', 'no ', 'apt', 'daire', 'kat', 'blok',
+                        'street', 'avenue', 'road', 'boulevard', 'lane', 'drive', 'way',
+                        'cd.', 'cd ', 'sk.', 'sk ', 'mh.', 'mh ']
+    text_lower = text.lower()
+    if any(keyword in text_lower for keyword in address_keywords):
+        return True
+    if re.search(r'\d{5}', text):
+        return True
+    if re.search(r'[A-Z0-9]+\+[A-Z0-9]+', text):
+        return True
+    return False
+
+
+def synthetic_texts(rows, seed=7):
+    """Texts shaped like what the Io6YTe nodes of Turkish listings contain."""
+    rng = random.Random(seed)
+
+    def digits(n):
+        return ''.join(rng.choice('0123456789') for _ in range(n))
+
+    makers = [
+        lambda: f"+90 5{digits(2)} {digits(3)} {digits(2)} {digits(2)}",
+        lambda: f"0090 5{digits(2)} {digits(7)}",
+        lambda: f"05{digits(2)} {digits(3)} {digits(2)} {digits(2)}",
+        lambda: f"(0{rng.choice('234')}{digits(2)}) {digits(3)} {digits(2)} {digits(2)}",
+        lambda: f"{rng.choice(['Atatürk', 'Bağdat', 'İstiklal'])} Cad. No:{rng.randint(1, 200)}, 34{digits(3)} İstanbul",
+        lambda: f"{digits(4)}+{digits(2)} Kadıköy/İstanbul",
+        lambda: rng.choice(['Open 24 hours', 'example.com', 'Closes 11 PM', 'Sahibi tarafından doğrulandı']),
+    ]
+    return [rng.choice(makers)() for _ in range(rows)]
+
+
+def timed(label, func, rows):
+    gc.collect()
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    print(f"{label:<34} {seconds * 1000:9.1f} ms  {rows / seconds:12,.0f} rows/s")
+    return result, seconds
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    texts = synthetic_texts(rows)
+    classifier = PhoneClassifier('TR')
+
+    def legacy_pass():
+        return [(legacy_is_mobile_phone(t), legacy_looks_like_address(t), legacy_is_valid_phone(t)) for t in texts]
+
+    def compiled_pass():
+        return [(classifier.is_mobile_phone(t), classifier.looks_like_address(t), classifier.is_valid_phone(t))
+                for t in texts]
+
+    print(f"Classifying {rows:,} texts")
+    legacy, legacy_seconds = timed('legacy scraper methods (scalar)', legacy_pass, rows)
+    compiled, compiled_seconds = timed('PhoneClassifier (scalar)', compiled_pass, rows)
+    frame, series_seconds = timed('PhoneClassifier.classify_series', lambda: classifier.classify_series(texts), rows)
+    print(f"speed-up: scalar x{legacy_seconds / compiled_seconds:.1f}, "
+          f"vectorized mobile+E.164 x{legacy_seconds / series_seconds:.1f}")
+
+    for index, name in enumerate(['is_mobile_phone', 'looks_like_address', 'is_valid_phone']):
+        differing = [t for t, old, new in zip(texts, legacy, compiled) if old[index] != new[index]]
+        print(f"{name}: {len(differing):,} disagreements with the legacy method", end='')
+        print(f" (e.g. {differing[0]!r})" if differing else '')
+
+    mismatched = sum(1 for (new, _, _), vectorized in zip(compiled, frame['is_mobile']) if new != vectorized)
+    if mismatched:
+        raise SystemExit(f"classify_series disagrees with the scalar classifier on {mismatched} rows")
+
+
+if __name__ == '__main__':
+    main()
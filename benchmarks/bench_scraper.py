@@ -0,0 +1,175 @@
+"""End-to-end scraper benchmark against the local Google Maps stand-in.
+
+Runs ``GoogleMapsScraper.scrape`` (or ``AsyncGoogleMapsScraper`` with
+``--engine async``, or the browser-free HTTP mode with ``--engine http``) pointed at
+``benchmarks.maps_stand_in`` and reports places per second, latency percentiles
+per phase and WebDriver round trips per place. With ``--baseline`` the results are
+compared against a previous run and the process exits non-zero when anything got
+worse by more than ``--threshold``; ``--save`` writes a new baseline.
+
+Run with ``python -m benchmarks.bench_scraper --save benchmarks/baseline.json`` once,
+then ``python -m benchmarks.bench_scraper --baseline benchmarks/baseline.json``.
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from benchmarks.maps_stand_in import MapsStandIn
+from scraper.async_scraper import AsyncGoogleMapsScraper
+from scraper.google_maps_scraper import GoogleMapsScraper, create_chrome_driver
+from scraper.pacing import WaitScheduler
+
+PHASES = ['page_load', 'pane_wait', 'feed_step']
+
+# metric -> True when a higher value is better
+REGRESSION_METRICS = {
+    'places_per_second': True,
+    'page_load_p90': False,
+    'pane_wait_p90': False,
+    'feed_step_p90': False,
+    'round_trips_per_place': False,
+}
+
+
+def percentile(values, q):
+    """Linear-interpolated percentile of ``values`` (q in 0-100), or None when empty."""
+    if not values:
+        return None
+    values = sorted(values)
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def run_benchmark(query='restaurants in Kadikoy', max_results=40, max_pages=5, repeat=3, extraction='snapshot',
+                  engine='selenium', concurrency=8, rate=None, **stand_in_options):
+    """Scrape ``query`` from a fresh stand-in ``repeat`` times and summarise the runs.
+
+    The ``selenium`` engine reuses one driver for every run; the ``async`` engine
+    launches its browser per run, and that launch is left out of the timings. The
+    ``http`` engine scrapes without a browser and only sees the first results page.
+    Pacing is off unless ``rate`` (actions per second) is given; one scheduler is
+    kept across runs so its wait timeouts adapt as they would in a long scrape.
+    """
+    pacing = WaitScheduler(rate=rate)
+    driver = create_chrome_driver() if engine == 'selenium' else None
+    phases = {phase: [] for phase in PHASES}
+    round_trips = []
+    places = 0
+    seconds = 0.0
+    try:
+        with MapsStandIn(**stand_in_options) as server:
+            expected = min(max_results, server.expected_records(query, http=engine == 'http'))
+            for run in range(repeat):
+                started = time.time()
+                if engine == 'async':
+                    scraper = AsyncGoogleMapsScraper(concurrency=concurrency, base_url=server.url)
+                    csv_string = asyncio.run(scraper.scrape(query, max_results, max_pages))
+                elif engine == 'http':
+                    scraper = GoogleMapsScraper(http=True, base_url=server.url, pacing=pacing)
+                    csv_string = scraper.scrape(query, max_results, max_pages)
+                else:
+                    # Reset the stand-in's sessionStorage so every run starts from an unscrolled feed
+                    driver.get(server.url + '/search/')
+                    driver.execute_script('sessionStorage.clear()')
+                    started = time.time()
+                    scraper = GoogleMapsScraper(driver=driver, extraction=extraction, base_url=server.url,
+                                                pacing=pacing)
+                    csv_string = scraper.scrape(query, max_results, max_pages)
+                elapsed = time.time() - started - sum(scraper.timings['driver_init'])
+
+                found = len(csv_string.strip().splitlines()) - 1 if csv_string.strip() else 0
+                print(f"Run {run + 1}/{repeat}: {found}/{expected} places in {elapsed:.2f}s")
+                places += found
+                seconds += elapsed
+                phases['page_load'].extend(scraper.timings['page_load'])
+                phases['pane_wait'].extend(scraper.timings['pane_wait'])
+                phases['feed_step'].extend(scraper.timings['feed_scroll'])
+                round_trips.extend(place['round_trips'] for place in scraper.stats.places if 'round_trips' in place)
+    finally:
+        if driver:
+            driver.quit()
+
+    pacing_report = pacing.report()
+    results = {
+        'query': query,
+        'engine': engine,
+        'extraction': extraction,
+        'runs': repeat,
+        'places': places,
+        'expected_places': expected * repeat,
+        'places_per_second': places / seconds if seconds else 0.0,
+        'round_trips_per_place': sum(round_trips) / len(round_trips) if round_trips else None,
+        'waits_recovered': pacing_report['recovered'],
+        'waits_timed_out': pacing_report['timed_out'],
+    }
+    for phase, values in phases.items():
+        for q in (50, 90, 99):
+            results[f"{phase}_p{q}"] = percentile(values, q)
+    return results
+
+
+def find_regressions(results, baseline, threshold):
+    """Return a message for every metric that is more than ``threshold`` (a fraction) worse than ``baseline``."""
+    regressions = []
+    for metric, higher_is_better in REGRESSION_METRICS.items():
+        new, old = results.get(metric), baseline.get(metric)
+        if new is None or not old:
+            continue
+        change = (new - old) / old
+        if (-change if higher_is_better else change) > threshold:
+            regressions.append(f"{metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the scraper against a local Google Maps stand-in.')
+    parser.add_argument('--query', default='restaurants in Kadikoy')
+    parser.add_argument('--max-results', type=int, default=40)
+    parser.add_argument('--max-pages', type=int, default=5)
+    parser.add_argument('--repeat', type=int, default=3, help='Scrapes to run and aggregate')
+    parser.add_argument('--extraction', default='snapshot', choices=['snapshot', 'html', 'elements'])
+    parser.add_argument('--engine', default='selenium', choices=['selenium', 'async', 'http'])
+    parser.add_argument('--concurrency', type=int, default=8, help='Concurrent pages for the async engine')
+    parser.add_argument('--rate', type=float, default=None, help='Paced actions per second (default: unpaced)')
+    parser.add_argument('--places', type=int, default=60, help='Places in the stand-in feed')
+    parser.add_argument('--latency', type=float, default=0.05, help='Seconds added to every HTTP response')
+    parser.add_argument('--scroll-latency', type=float, default=0.2, help='Seconds before the feed appends results')
+    parser.add_argument('--recorded', default=None, help='Directory of archived details pages to serve')
+    parser.add_argument('--baseline', default=None, help='Results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.2, help='Allowed slowdown as a fraction, e.g. 0.2')
+    parser.add_argument('--save', default=None, help='Write the results JSON here')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.query, args.max_results, args.max_pages, args.repeat, args.extraction,
+                            args.engine, args.concurrency, args.rate, places_per_query=args.places, latency=args.latency,
+                            scroll_latency=args.scroll_latency, recorded_dir=args.recorded)
+
+    print(f"\n{results['places']}/{results['expected_places']} places, "
+          f"{results['places_per_second']:.2f} places/s, "
+          f"{results['round_trips_per_place'] or 0:.1f} WebDriver round trips per place, "
+          f"{results['waits_recovered']} waits recovered, {results['waits_timed_out']} timed out")
+    for phase in PHASES:
+        if results[f"{phase}_p50"] is not None:
+            print(f"  {phase}: p50 {results[f'{phase}_p50']:.3f}s, p90 {results[f'{phase}_p90']:.3f}s, "
+                  f"p99 {results[f'{phase}_p99']:.3f}s")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"Saved results to {args.save}")
+
+    failures = []
+    if results['places'] < results['expected_places']:
+        failures.append(f"scraped {results['places']} places, expected {results['expected_places']}")
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            failures.extend(find_regressions(results, json.load(f), args.threshold))
+    if failures:
+        raise SystemExit("Benchmark regressions:\n  " + "\n  ".join(failures))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Startup benchmark: time from a fresh interpreter to the first ``driver.get``.
+
+Every sample runs in a new Python process, so module import cost is included. The
+``cold`` samples start without a remembered chromedriver resolution and the ``warm``
+ones reuse the resolution the cold run saved.
+
+Run with ``python -m benchmarks.bench_startup [--runs 3] [--imports-only]``.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def child(imports_only):
+    started = time.perf_counter()
+    from scraper.google_maps_scraper import create_chrome_driver
+    timings = {'import': time.perf_counter() - started}
+    if not imports_only:
+        driver = create_chrome_driver()
+        timings['driver'] = time.perf_counter() - started - timings['import']
+        driver.get('data:text/html,<title>ready</title>')
+        timings['first_get'] = time.perf_counter() - started
+        driver.quit()
+    print(json.dumps(timings))
+
+
+def sample(cache_path, imports_only):
+    env = dict(os.environ, SCRAPER_DRIVER_CACHE=cache_path)
+    command = [sys.executable, '-m', 'benchmarks.bench_startup', '--child']
+    if imports_only:
+        command.append('--imports-only')
+    output = subprocess.run(command, env=env, capture_output=True, text=True, check=True,
+                            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def report(name, samples):
+    for key in samples[0]:
+        values = sorted(s[key] for s in samples)
+        print(f"{name:>5} {key:>10}: median {values[len(values) // 2]:.3f}s, min {values[0]:.3f}s, "
+              f"max {values[-1]:.3f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure scraper startup time to the first driver.get.')
+    parser.add_argument('--runs', type=int, default=3, help='Warm samples to take')
+    parser.add_argument('--imports-only', action='store_true', help='Only time importing the scraper module')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.imports_only)
+        return
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        cache_path = os.path.join(cache_dir, 'chromedriver.json')
+        cold = [sample(cache_path, args.imports_only)]
+        warm = [sample(cache_path, args.imports_only) for _ in range(args.runs)]
+    report('cold', cold)
+    report('warm', warm)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,332 @@
+"""A local HTTP server that imitates the parts of Google Maps the scraper touches.
+
+Search pages have a scrollable ``div[role=feed]`` of ``a.hfpxzc`` links that grows
+as it is scrolled and ends with the ``span.HlvSq`` end-of-list marker; some entries
+are sponsored or carry "· Visited link". Place pages have the ``DUwDvf lfPIob``
+h1 and ``AeaXub``/``Io6YTe`` panes with an address, a phone button and a website
+link. Synthetic pages also embed the places as ``APP_INITIALIZATION_STATE``
+payloads for the browser-free HTTP mode; the search payload holds the first
+``page_size`` organic results, like Maps does. Places are synthetic, or come from
+details pages saved with ``GoogleMapsScraper(archive_dir=...)``. ``latency`` delays every response and
+``scroll_latency`` delays each batch of results the feed appends.
+
+Run with ``python -m benchmarks.maps_stand_in`` to browse it by hand.
+"""
+import glob
+import html
+import json
+import os
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, unquote, urlsplit
+
+from scraper.extraction import FEATURE_ID_RE
+from scraper.http_extractor import (
+    PLACE_FIELDS, PLACE_PAGE_PLACE, PLACE_PAYLOAD_SLOT, SEARCH_PAYLOAD_SLOT, SEARCH_RESULT_PLACE, SEARCH_RESULTS,
+    XSSI_PREFIX,
+)
+
+STREETS = ['Bagdat Cad.', 'Moda Cad.', 'Sogutlucesme Cad.', 'Bahariye Cad.', 'Muhurdar Sok.', 'Kadife Sok.']
+KINDS = ['Cafe', 'Restaurant', 'Kebap', 'Bakery', 'Meyhane', 'Burger', 'Pide Salonu', 'Balik Evi']
+
+SEARCH_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title} - Google Maps</title>
+<style>
+body {{ margin: 0; font-family: sans-serif; }}
+div[role="feed"] {{ height: 700px; width: 420px; overflow-y: auto; }}
+a.hfpxzc {{ display: block; height: 90px; border-bottom: 1px solid #ddd; }}
+</style></head>
+<body>
+<h1 class="DUwDvf lfPIob">Results</h1>
+<div role="feed" aria-label="Results for {title}"></div>
+<script>
+var places = {places};
+var pageSize = {page_size};
+var scrollLatency = {scroll_latency};
+var feed = document.querySelector('div[role="feed"]');
+var storageKey = 'loaded:' + location.pathname;
+var loaded = 0;
+var loading = false;
+function append(count) {{
+    places.slice(loaded, loaded + count).forEach(function (place) {{
+        var link = document.createElement('a');
+        link.className = 'hfpxzc';
+        link.href = place.href;
+        link.setAttribute('aria-label', place.label);
+        link.innerHTML = '<div>' + place.label + '</div>' + (place.sponsored ? '<span>Sponsored</span>' : '');
+        feed.appendChild(link);
+    }});
+    loaded = Math.min(places.length, loaded + count);
+    sessionStorage.setItem(storageKey, loaded);
+    if (loaded >= places.length && !document.querySelector('span.HlvSq')) {{
+        var end = document.createElement('span');
+        end.className = 'HlvSq';
+        end.textContent = "You've reached the end of the list.";
+        feed.appendChild(end);
+    }}
+}}
+feed.addEventListener('scroll', function () {{
+    if (loading || loaded >= places.length || feed.scrollTop + feed.clientHeight < feed.scrollHeight - 50) {{
+        return;
+    }}
+    loading = true;
+    setTimeout(function () {{ append(pageSize); loading = false; }}, scrollLatency);
+}});
+// Coming back from a place page keeps what was already scrolled in, like the real feed
+append(Math.max(pageSize, parseInt(sessionStorage.getItem(storageKey) || '0', 10)));
+</script>
+<script>window.APP_INITIALIZATION_STATE={app_state};</script>
+</body></html>
+"""
+
+PLACE_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{name} - Google Maps</title></head>
+<body>
+<h1 class="DUwDvf lfPIob">{name}</h1>
+<div class="AeaXub"><div class="Io6YTe">{address}</div></div>
+{phone}
+{website}
+<script>window.APP_INITIALIZATION_STATE={app_state};</script>
+</body></html>
+"""
+
+
+class StandInPlace:
+    def __init__(self, name, address, phone, website, sponsored=False, visited=False, page_html=None):
+        self.name = name
+        self.address = address
+        self.phone = phone
+        self.website = website
+        self.sponsored = sponsored
+        self.visited = visited
+        # Recorded details page, served verbatim instead of the PLACE_PAGE template
+        self.page_html = page_html
+        self.feature_id = None
+
+
+class MapsStandIn:
+    """Serves Maps-like search and place pages on ``http://127.0.0.1:<port>/maps``.
+
+    Every query gets ``places_per_query`` places, generated deterministically from
+    ``seed`` and the query text; the feed shows ``page_size`` of them at first and
+    appends ``page_size`` more per scroll. A query that equals a place name opens
+    that place directly, like a single-business search on Google Maps.
+    """
+
+    def __init__(self, places_per_query=60, page_size=20, latency=0.05, scroll_latency=0.2,
+                 sponsored_every=9, visited_every=13, seed=7, recorded_dir=None, port=0):
+        self.places_per_query = places_per_query
+        self.page_size = page_size
+        self.latency = latency
+        self.scroll_latency = scroll_latency
+        self.sponsored_every = sponsored_every
+        self.visited_every = visited_every
+        self.seed = seed
+        self.recorded = [_recorded_place(path) for path in sorted(glob.glob(os.path.join(recorded_dir, '*.html')))] \
+            if recorded_dir else []
+        self.port = port
+        self.requests = 0
+        self._queries = {}  # query -> [(feature_id, StandInPlace)]
+        self._places = {}  # feature_id -> StandInPlace
+        self._lock = threading.Lock()
+        self._server = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.port}/maps"
+
+    def start(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stand_in._handle(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(('127.0.0.1', self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def places_for(self, query):
+        """The ``(feature_id, place)`` pairs in the feed for ``query``, in feed order."""
+        with self._lock:
+            if query not in self._queries:
+                self._queries[query] = self._generate(query)
+                self._places.update(self._queries[query])
+            return self._queries[query]
+
+    def expected_records(self, query, http=False):
+        """How many places in the feed the scraper should return a record for.
+
+        With ``http`` only the places embedded in the search response count.
+        """
+        from scraper.html_extractor import extract_from_html
+
+        places = self._embedded_places(query) if http else \
+            [place for _, place in self.places_for(query) if not place.sponsored and not place.visited]
+        return sum(1 for place in places if extract_from_html(self._place_html(place), place.name))
+
+    def _generate(self, query):
+        rng = random.Random(f"{self.seed}:{query}")
+        query_hash = zlib.crc32(query.encode('utf-8'))
+        places = []
+        for index in range(self.places_per_query):
+            if self.recorded:
+                place = self.recorded[index % len(self.recorded)]
+                place = StandInPlace(place.name, None, None, None, page_html=place.page_html)
+            else:
+                name = f"{rng.choice(KINDS)} {rng.choice(['Moda', 'Kadikoy', 'Fenerbahce', 'Yeldegirmeni'])} {index + 1}"
+                address = f"Caferaga, {rng.choice(STREETS)} No:{rng.randint(1, 120)}, 34710 Kadikoy/Istanbul"
+                # Roughly half of the places list a mobile number; the rest a landline or nothing
+                roll = rng.random()
+                if roll < 0.5:
+                    phone = f"+90 5{rng.randint(30, 59)} {rng.randint(100, 999)} {rng.randint(10, 99)} {rng.randint(10, 99)}"
+                elif roll < 0.8:
+                    phone = f"(0216) {rng.randint(300, 399)} {rng.randint(10, 99)} {rng.randint(10, 99)}"
+                else:
+                    phone = None
+                website = f"https://{name.lower().replace(' ', '')}.example.com/" if rng.random() < 0.6 else None
+                place = StandInPlace(name, address, phone, website)
+            place.sponsored = bool(self.sponsored_every) and index % self.sponsored_every == self.sponsored_every - 1
+            place.visited = bool(self.visited_every) and index % self.visited_every == self.visited_every - 1
+            place.feature_id = f"0x{query_hash:x}:0x{index:x}"
+            places.append((place.feature_id, place))
+        return places
+
+    def _handle(self, request):
+        with self._lock:
+            self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+        path = unquote(urlsplit(request.path).path)
+        body = None
+        if path.startswith('/maps/search/'):
+            body = self._search_html(path[len('/maps/search/'):])
+        elif path.startswith('/maps/place/'):
+            match = FEATURE_ID_RE.search(path)
+            place = self._places.get(match.group(1)) if match else None
+            if place:
+                body = self._place_html(place)
+
+        if body is None:
+            request.send_error(404)
+            return
+        payload = body.encode('utf-8')
+        request.send_response(200)
+        request.send_header('Content-Type', 'text/html; charset=utf-8')
+        request.send_header('Content-Length', str(len(payload)))
+        request.send_header('Cache-Control', 'no-store')
+        request.end_headers()
+        request.wfile.write(payload)
+
+    def _search_html(self, query):
+        with self._lock:
+            known = list(self._places.values())
+        for place in known:
+            if place.name.lower() == query.lower():
+                return self._place_html(place)
+
+        places = self.places_for(query)
+
+        feed = [{
+            'href': f"{self.url}/place/{quote(place.name)}/data=!4m7!3m6!1s{feature_id}!8m2!3d40.98!4d29.02",
+            'label': place.name + (' · Visited link' if place.visited else ''),
+            'sponsored': place.sponsored,
+        } for feature_id, place in places]
+        results = [_set([], SEARCH_RESULT_PLACE, _place_array(place)) for place in self._embedded_places(query)]
+        app_state = _app_state(SEARCH_PAYLOAD_SLOT, _set([], SEARCH_RESULTS, results))
+        return SEARCH_PAGE.format(title=html.escape(query), places=json.dumps(feed), page_size=self.page_size,
+                                  scroll_latency=int(self.scroll_latency * 1000), app_state=app_state)
+
+    def _embedded_places(self, query):
+        # The organic results of the first feed page; sponsored entries and (browser-side) visited
+        # links are left out so HTTP and browser scrapes of the stand-in agree
+        return [place for _, place in self.places_for(query)[:self.page_size]
+                if not place.sponsored and not place.visited and not place.page_html]
+
+    def _place_html(self, place):
+        if place.page_html:
+            return place.page_html
+        phone = ''
+        if place.phone:
+            digits = ''.join(c for c in place.phone if c.isdigit() or c == '+')
+            phone = (f'<button aria-label="Phone: {html.escape(place.phone)}" data-item-id="phone:tel:{digits}">'
+                     f'<div class="Io6YTe">{html.escape(place.phone)}</div></button>')
+        website = ''
+        if place.website:
+            website = (f'<a aria-label="Website: {html.escape(place.website)}" href="{html.escape(place.website)}">'
+                       f'<div class="Io6YTe">{html.escape(place.website)}</div></a>')
+        app_state = _app_state(PLACE_PAYLOAD_SLOT, _set([], PLACE_PAGE_PLACE, _place_array(place)))
+        return PLACE_PAGE.format(name=html.escape(place.name), address=html.escape(place.address),
+                                 phone=phone, website=website, app_state=app_state)
+
+
+def _set(data, path, value):
+    """Put ``value`` at ``path`` in nested lists, padding with None; returns ``data``."""
+    node = data
+    for depth, index in enumerate(path):
+        node.extend([None] * (index + 1 - len(node)))
+        if depth == len(path) - 1:
+            node[index] = value
+        else:
+            if not isinstance(node[index], list):
+                node[index] = []
+            node = node[index]
+    return data
+
+
+def _place_array(place):
+    data = []
+    for field, value in (('name', place.name), ('address', place.address),
+                         ('address_lines', place.address.split(', ')), ('website', place.website),
+                         ('phone', place.phone), ('feature_id', place.feature_id)):
+        if value:
+            _set(data, PLACE_FIELDS[field], value)
+    return data
+
+
+def _app_state(slot, payload):
+    state = _set([], (3, slot), XSSI_PREFIX + '\n' + json.dumps(payload))
+    # Keep "</script>" inside strings from closing the script element
+    return json.dumps(state).replace('</', '<\\/')
+
+
+def _recorded_place(path):
+    from scraper.html_extractor import snapshot_from_html
+
+    with open(path, encoding='utf-8') as f:
+        page_html = f.read()
+    name = snapshot_from_html(page_html)['name'] or os.path.basename(path)
+    return StandInPlace(name, None, None, None, page_html=page_html)
+
+
+if __name__ == '__main__':
+    import sys
+
+    with MapsStandIn(recorded_dir=sys.argv[1] if len(sys.argv) > 1 else None, port=8765) as server:
+        print(f"Serving Google Maps stand-in on {server.url}/search/<query> (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,85 @@
+"""Offline simulation of the tiling planner on a synthetic region with known density.
+
+Places are scattered over the region as a thin uniform background plus a few dense
+clusters (city centres). A fake ``harvest`` plays the Maps feed: it returns the
+places inside a tile, capped at ``--feed-cap`` like the real feed, in a shuffled
+order, plus a few from just outside the tile as the real viewport does. Since the
+ground truth is known, the report shows recall next to the planner's own coverage
+and saturation figures.
+
+Run with ``python -m benchmarks.sim_tiling [--places 5000] [--feed-cap 120]``.
+"""
+import argparse
+import random
+import time
+
+from scraper.tiling import Tile, TilePlanner
+
+
+def synthetic_places(bounds, count, clusters=4, cluster_share=0.7, spread=0.03, seed=7):
+    """``count`` places as ``(lat, lng, href)``; ``cluster_share`` of them fall in Gaussian clusters."""
+    rng = random.Random(seed)
+    south, west, north, east = bounds
+    centres = [(rng.uniform(south, north), rng.uniform(west, east)) for _ in range(clusters)]
+    places = []
+    while len(places) < count:
+        if rng.random() < cluster_share:
+            lat, lng = rng.choice(centres)
+            lat, lng = rng.gauss(lat, spread * (north - south)), rng.gauss(lng, spread * (east - west))
+        else:
+            lat, lng = rng.uniform(south, north), rng.uniform(west, east)
+        if south <= lat < north and west <= lng < east:
+            index = len(places)
+            places.append((lat, lng, f"https://www.google.com/maps/place/Place+{index}/data=!4m2!3m1!1s0x{index:x}:0x{index:x}"))
+    return places
+
+
+def fake_harvest(places, feed_cap, overlap=0.1, latency=0.0, seed=7):
+    """A TilePlanner ``harvest`` that answers from ``places`` the way a capped Maps feed would."""
+    def harvest(tile):
+        # The viewport shows a margin around the tile, so neighbouring tiles overlap a little
+        lat_margin = (tile.north - tile.south) * overlap
+        lng_margin = (tile.east - tile.west) * overlap
+        view = Tile(tile.south - lat_margin, tile.west - lng_margin, tile.north + lat_margin, tile.east + lng_margin)
+        inside = [place for place in places if view.contains(place[0], place[1])]
+        random.Random(f"{seed}:{tile!r}").shuffle(inside)
+        if latency:
+            time.sleep(latency)
+        return [{'href': href, 'name': href.split('/')[5]} for _, _, href in inside[:feed_cap]]
+    return harvest
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Simulate the tiling planner on synthetic places.')
+    parser.add_argument('--bounds', default='40.95,28.95,41.10,29.15', help='south,west,north,east')
+    parser.add_argument('--places', type=int, default=5000, help='Places in the region')
+    parser.add_argument('--clusters', type=int, default=4)
+    parser.add_argument('--feed-cap', type=int, default=120, help='Most results a feed returns')
+    parser.add_argument('--saturation', type=int, default=100)
+    parser.add_argument('--grid', default='4x4')
+    parser.add_argument('--max-depth', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds each fake search takes')
+    args = parser.parse_args()
+
+    bounds = tuple(float(part) for part in args.bounds.split(','))
+    rows, cols = (int(part) for part in args.grid.lower().split('x'))
+    places = synthetic_places(bounds, args.places, args.clusters)
+
+    single = fake_harvest(places, args.feed_cap)(Tile(*bounds))
+    print(f"Single search: {len(single)}/{len(places)} places ({len(single) / len(places):.1%} recall)")
+
+    planner = TilePlanner(bounds, (rows, cols), args.saturation, args.max_depth)
+    started = time.time()
+    found = planner.run(fake_harvest(places, args.feed_cap, latency=args.latency), args.workers,
+                        progress_callback=lambda msg: None)
+    elapsed = time.time() - started
+    coverage = planner.coverage()
+    print(f"\nTiled search: {len(found)}/{len(places)} places ({len(found) / len(places):.1%} recall) "
+          f"in {elapsed:.2f}s")
+    for key, value in coverage.items():
+        print(f"  {key}: {value:.3f}" if isinstance(value, float) else f"  {key}: {value}")
+
+
+if __name__ == '__main__':
+    main()
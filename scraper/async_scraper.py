@@ -0,0 +1,287 @@
+import asyncio
+import time
+
+from scraper.classifier import get_classifier
+from scraper.extraction import (
+    BUSINESS_NAME_XPATH, DETAILS_PANE_XPATH, MAPS_URL, PANE_SNAPSHOT_JS, SNAPSHOT_ARGS, classify_snapshot,
+    place_id_from_href,
+)
+from scraper.feed import FEED_SCROLL_JS
+from scraper.google_maps_scraper import HARVEST_FEED_JS
+from scraper.network import NetworkPolicy
+from scraper.stats import ScrapeStats
+
+# Resolves once the search page shows result links or a business h1
+PAGE_READY_JS = """
+(xpath) => !!(document.querySelector('a.hfpxzc')
+    || document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue)
+"""
+
+BUSINESS_NAME_JS = """
+(xpath) => {
+    var node = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    return node ? node.innerText : null;
+}
+"""
+
+
+def _selenium_script(script):
+    # The shared scripts are Selenium execute_script bodies: they read ``arguments`` and ``return`` at top level
+    return f"(args) => (function () {{ {script} }}).apply(null, args)"
+
+
+def _selenium_async_script(script):
+    # execute_async_script bodies resolve by calling the callback passed as their last argument
+    return (f"(args) => new Promise(function (done) {{ "
+            f"(function () {{ {script} }}).apply(null, args.concat([done])); }})")
+
+
+class AsyncGoogleMapsScraper:
+    """Asyncio scraping engine that drives many pages of one Chrome over the DevTools protocol.
+
+    The results feed is scrolled on one page while place details load concurrently on
+    up to ``concurrency`` further pages, so a single browser process and a single Python
+    thread keep many loads in flight. It applies the same snapshot script and
+    classification rules as ``GoogleMapsScraper`` and returns the same records, in feed
+    order. Chrome is launched through Playwright, or attached to with ``cdp_url``
+    (e.g. ``http://localhost:9222`` for a Chrome started with ``--remote-debugging-port``).
+
+    Playwright is optional: ``pip install playwright && playwright install chromium``.
+    """
+
+    def __init__(self, concurrency=8, headless=True, cdp_url=None, lean=False, cache=None, country=None,
+                 base_url=None, stats=None, pane_timeout=15.0, step_timeout=4.0):
+        self.concurrency = concurrency
+        self.headless = headless
+        self.cdp_url = cdp_url
+        self.network_policy = NetworkPolicy() if lean is True else (lean or None)
+        self.cache = cache
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self.classifier = get_classifier(country)
+        self.base_url = (base_url or MAPS_URL).rstrip('/')
+        self.stats = stats or ScrapeStats()
+        self.timings = self.stats.phases
+        self.pane_timeout = pane_timeout
+        self.step_timeout = step_timeout
+        self.pages_loaded = 0
+        self._playwright = None
+        self._browser = None
+        self._context = None
+        self._idle_pages = []
+        self._semaphore = None
+
+    async def start(self):
+        try:
+            from playwright.async_api import async_playwright
+        except ImportError:
+            raise ImportError("AsyncGoogleMapsScraper needs Playwright: "
+                              "pip install playwright && playwright install chromium")
+
+        with self.stats.timer('driver_init'):
+            self._playwright = await async_playwright().start()
+            if self.cdp_url:
+                self._browser = await self._playwright.chromium.connect_over_cdp(self.cdp_url)
+            else:
+                self._browser = await self._playwright.chromium.launch(
+                    headless=self.headless,
+                    args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu', '--disable-extensions'],
+                )
+            self._context = await self._browser.new_context(
+                viewport={'width': 1920, 'height': 1080},
+                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                           'Chrome/120.0.0.0 Safari/537.36',
+            )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self
+
+    async def close(self):
+        if self._context:
+            await self._context.close()
+        # A browser we only attached to keeps running; closing the connection is enough
+        if self._browser:
+            await self._browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+        self._playwright = self._browser = self._context = None
+        self._idle_pages = []
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def scrape(self, query, max_results=100, max_pages=5, progress_callback=None):
+        """Scrape ``query`` into a CSV string, like ``GoogleMapsScraper.scrape``."""
+        import pandas as pd
+
+        records = await self.scrape_records(query, max_results, max_pages, progress_callback)
+        return pd.DataFrame(records).to_csv(index=False)
+
+    async def scrape_records(self, query, max_results=100, max_pages=5, progress_callback=None):
+        started_here = self._context is None
+        if started_here:
+            await self.start()
+        try:
+            return await self._scrape(query, max_results, max_pages, progress_callback)
+        finally:
+            self.stats.add_cache(self.cache_stats)
+            self.stats.finish()
+            if started_here:
+                await self.close()
+
+    async def _scrape(self, query, max_results, max_pages, progress_callback):
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        if progress_callback:
+            progress_callback("Loading Google Maps...")
+
+        page = await self._new_page()
+        try:
+            started = time.time()
+            await page.goto(f"{self.base_url}/search/{query}")
+            self.pages_loaded += 1
+            try:
+                await page.wait_for_function(PAGE_READY_JS, arg=BUSINESS_NAME_XPATH, timeout=15000)
+            except Exception:
+                pass  # Continue even if elements not found immediately, like the Selenium scraper
+            self.timings['page_load'].append(time.time() - started)
+
+            name = await page.evaluate(BUSINESS_NAME_JS, BUSINESS_NAME_XPATH)
+            if name and query.lower() in name.strip().lower():
+                print(f"Direct business match found: {name.strip()}")
+                record = await self._extract_record(page, name.strip(), place_id_from_href(page.url))
+                return [record] if record else []
+
+            return await self._scrape_feed(page, max_results, max_pages, progress_callback)
+        finally:
+            await page.close()
+
+    async def _scrape_feed(self, page, max_results, max_pages, progress_callback):
+        tasks = []  # one detail task per place, in feed order
+        seen = set()
+        try:
+            for i in range(max_pages):
+                for entry in await page.evaluate(_selenium_script(HARVEST_FEED_JS), []):
+                    href, name = entry['href'], entry['name']
+                    if not href or not name or href in seen:
+                        continue
+                    seen.add(href)
+                    if entry['sponsored']:
+                        self.stats.skip('sponsored')
+                        continue
+                    if "· Visited link" in name:
+                        self.stats.skip('visited')
+                        continue
+                    tasks.append(asyncio.ensure_future(self._extract_place(href, name)))
+
+                if progress_callback:
+                    progress_callback(f"Page {i+1}: {len(tasks)} places queued")
+                # Each place yields at most one record, so below max_results places more are needed for
+                # sure and the feed keeps scrolling while details load; past that, see what came back first
+                if len(tasks) >= max_results:
+                    await asyncio.gather(*tasks)
+                    if sum(1 for task in tasks if task.result()) >= max_results:
+                        break
+
+                step = await self._load_more(page)
+                if step['end'] and step['added'] == 0:
+                    print("Reached the end of the results list.")
+                    break
+
+            records = []
+            for task in tasks:
+                record = await task
+                if record:
+                    records.append(record)
+                    if len(records) >= max_results:
+                        break
+            if progress_callback:
+                progress_callback(f"Scraping completed! Found {len(records)} results.")
+            return records
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _load_more(self, page):
+        started = time.time()
+        result = await page.evaluate(_selenium_async_script(FEED_SCROLL_JS), [int(self.step_timeout * 1000)])
+        step = {
+            'added': max(0, result['after'] - result['before']),
+            'total': result['after'],
+            'seconds': round(time.time() - started, 3),
+            'end': bool(result['end']),
+        }
+        self.stats.add_time('feed_scroll', step['seconds'])
+        return step
+
+    async def _extract_place(self, href, business_name):
+        try:
+            return await self._open_place(href, business_name)
+        except Exception as e:
+            print(f"Error: {e}")
+            self.stats.skip('error')
+            return None
+
+    async def _open_place(self, href, business_name):
+        place_id = place_id_from_href(href)
+        if self.cache and place_id:
+            hit, record = self.cache.get(place_id, self.classifier.country)
+            self.cache_stats['hits' if hit else 'misses'] += 1
+            if hit:
+                self.stats.place(business_name, place_id, 'record' if record else 'no_mobile_phone', cached=True)
+                return record
+
+        async with self._semaphore:
+            page = self._idle_pages.pop() if self._idle_pages else await self._new_page()
+            try:
+                started = time.time()
+                try:
+                    await page.goto(href)
+                    self.pages_loaded += 1
+                    await page.wait_for_selector(f"xpath={DETAILS_PANE_XPATH}", timeout=self.pane_timeout * 1000)
+                except Exception:
+                    print(f"Pane did not load for {business_name}, skipping...")
+                    self.stats.place(business_name, place_id, 'pane_timeout', pane_wait=time.time() - started)
+                    return None
+                pane_wait = time.time() - started
+                self.timings['pane_wait'].append(pane_wait)
+                record = await self._extract_record(page, business_name, place_id, pane_wait)
+            finally:
+                self._idle_pages.append(page)
+
+        if self.cache and place_id:
+            self.cache.put(place_id, record, self.classifier.country)
+        return record
+
+    async def _extract_record(self, page, business_name, place_id=None, pane_wait=None):
+        started = time.time()
+        snapshot = await page.evaluate(_selenium_script(PANE_SNAPSHOT_JS), list(SNAPSHOT_ARGS))
+        details = classify_snapshot(snapshot, self.classifier)
+        record = None
+        phone = details['Phone']
+        if phone and phone != 'N/A' and phone.strip():
+            print(f"Scraped: {business_name}, {details['Address']}, {phone}, {details['Website']}")
+            record = {'Name': business_name, 'Address': details['Address'], 'Phone': phone,
+                      'Website': details['Website']}
+        else:
+            print(f"Skipped {business_name}: No mobile phone number found")
+        seconds = time.time() - started
+        self.stats.add_time('extract', seconds)
+        self.stats.place(business_name, place_id, 'record' if record else 'no_mobile_phone',
+                         pane_wait=pane_wait, extract=seconds, round_trips=1)
+        return record
+
+    async def _new_page(self):
+        page = await self._context.new_page()
+        if self.network_policy:
+            # Same URL block list as lean mode on the Selenium scraper, installed per page over CDP
+            session = await self._context.new_cdp_session(page)
+            await session.send('Network.enable')
+            await session.send('Network.setBlockedURLs', {'urls': self.network_policy.blocked_patterns()})
+        return page
+
+
+def scrape_async(query, max_results=100, max_pages=5, progress_callback=None, **scraper_options):
+    """Run ``AsyncGoogleMapsScraper.scrape`` to completion from synchronous code."""
+    return asyncio.run(AsyncGoogleMapsScraper(**scraper_options).scrape(query, max_results, max_pages,
+                                                                         progress_callback))
@@ -0,0 +1,237 @@
+import argparse
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from scraper.pacing import DEFAULT_RATE
+from scraper.sinks import MultiSink, SqliteSink, open_sink
+
+OUTPUT_COLUMNS = ['Name', 'Address', 'Phone', 'Website', 'Query']
+
+# Per-process state, set up once by _init_worker
+_worker = {}
+
+
+def read_queries(path):
+    """Read one query per line, skipping blank lines and ``#`` comments."""
+    with open(path, encoding='utf-8') as f:
+        lines = (line.strip() for line in f)
+        return [line for line in lines if line and not line.startswith('#')]
+
+
+def _init_worker(seen, accepted, lock, max_results, scraper_options, cache_path, checkpoint_path, rate):
+    from multiprocessing.util import Finalize
+
+    from scraper.cache import PlaceCache
+    from scraper.checkpoint import Checkpoint
+    from scraper.google_maps_scraper import create_chrome_driver
+    from scraper.pacing import WaitScheduler
+
+    # One driver per worker process, reused for every query the process picks up. HTTP mode
+    # needs none; a scraper that has to fall back to the browser then starts its own.
+    driver = None
+    if not scraper_options.get('http'):
+        driver = create_chrome_driver()
+        Finalize(None, _quit_driver, exitpriority=10)
+    _worker.update(
+        driver=driver,
+        seen=seen,
+        accepted=accepted,
+        lock=lock,
+        max_results=max_results,
+        scraper_options=scraper_options,
+        cache=PlaceCache(cache_path) if cache_path else None,
+        checkpoint=Checkpoint(checkpoint_path) if checkpoint_path else None,
+        # Kept across queries, so wait timeouts keep adapting and backoff carries over
+        pacing=WaitScheduler(rate=rate),
+    )
+
+
+def _quit_driver():
+    try:
+        if _worker.get('driver') is not None:
+            _worker['driver'].quit()
+    except Exception:
+        pass  # Already gone
+
+
+def _ensure_live_driver():
+    """Replace the worker's driver if Chrome has crashed or hung since the last query."""
+    from scraper.google_maps_scraper import create_chrome_driver
+
+    if _worker['driver'] is None:
+        return
+    try:
+        _worker['driver'].execute_script('return 1')
+    except Exception as e:
+        print(f"Worker {os.getpid()}: driver is not responding ({e}), starting a new one")
+        _quit_driver()
+        _worker['driver'] = None
+        _worker['driver'] = create_chrome_driver()
+
+
+def _global_limit_reached():
+    return _worker['max_results'] and _worker['accepted'].value >= _worker['max_results']
+
+
+def _scrape_query(query, per_query_results, max_pages):
+    """Scrape one query in a worker process and return its new, not yet seen records."""
+    from scraper.google_maps_scraper import GoogleMapsScraper
+
+    started = time.time()
+    records = []
+    error = None
+    if not _global_limit_reached():
+        places = None
+        try:
+            _ensure_live_driver()
+            scraper = GoogleMapsScraper(driver=_worker['driver'], cache=_worker['cache'],
+                                        checkpoint=_worker['checkpoint'], pacing=_worker['pacing'],
+                                        **_worker['scraper_options'])
+            places = scraper.iter_scrape(query, per_query_results, max_pages,
+                                         skip_place_ids=_worker['seen'], with_place_ids=True)
+            for place_id, record in places:
+                with _worker['lock']:
+                    if _global_limit_reached():
+                        break
+                    if place_id in _worker['seen']:
+                        continue
+                    _worker['seen'][place_id] = True
+                    _worker['accepted'].value += 1
+                records.append(dict(record, Query=query))
+        except Exception as e:
+            print(f"Error scraping '{query}': {e}")
+            error = str(e)
+        finally:
+            if places is not None:
+                places.close()
+
+    return {
+        'query': query,
+        'records': records,
+        'seconds': time.time() - started,
+        'worker': os.getpid(),
+        'error': error,  # None unless the query failed part-way; its records so far are kept
+    }
+
+
+def run_batch(queries, output_path, workers=2, max_results=None, per_query_results=100, max_pages=5,
+              cache_path=None, checkpoint_path=None, progress_callback=None, rate=DEFAULT_RATE, sqlite_path=None,
+              **scraper_options):
+    """Scrape many queries across a pool of worker processes into one merged output file.
+
+    Every worker process owns a Chrome driver. Businesses are deduplicated across
+    queries by place ID through a shared registry, and the run stops accepting new
+    records once ``max_results`` have been written in total. With ``checkpoint_path``
+    all workers journal their progress to one file; rerunning with the same path
+    rewrites the records found so far and only scrapes what is left. ``rate`` is the
+    number of page loads and clicks per second allowed across all workers (None for
+    no limit). The output format (CSV, JSONL, Parquet or SQLite) follows the extension
+    of ``output_path``; records are also appended to a ``records`` table in
+    ``sqlite_path`` when given. Returns run statistics, including per-worker throughput
+    and the error of every query that failed.
+    """
+    from scraper.checkpoint import Checkpoint
+
+    manager = multiprocessing.Manager()
+    seen = manager.dict()
+    accepted = manager.Value('i', 0)
+    lock = manager.Lock()
+
+    started = time.time()
+    worker_stats = {}
+    failed_queries = {}  # query -> error
+    written = 0
+    sink = open_sink(output_path, columns=OUTPUT_COLUMNS)
+    if sqlite_path:
+        sink = MultiSink([sink, SqliteSink(sqlite_path, columns=OUTPUT_COLUMNS, append=True)])
+    with sink:
+        pending = queries
+        if checkpoint_path:
+            checkpoint = Checkpoint(checkpoint_path)
+            for query, place_id, record in checkpoint.all_records():
+                if place_id in seen or (max_results and written >= max_results):
+                    continue
+                seen[place_id] = True
+                sink.write(dict(record, Query=query))
+                written += 1
+            accepted.value = written
+            pending = [query for query in queries if query not in checkpoint.done]
+            print(f"Resuming batch: {written} records restored, {len(pending)}/{len(queries)} queries left")
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(seen, accepted, lock, max_results, scraper_options,
+                                           cache_path, checkpoint_path, rate / workers if rate else None)) as executor:
+            futures = [executor.submit(_scrape_query, query, per_query_results, max_pages) for query in pending]
+            for done, future in enumerate(as_completed(futures), start=1):
+                result = future.result()
+                sink.write_many(result['records'])
+                sink.flush()
+                written += len(result['records'])
+
+                stats = worker_stats.setdefault(result['worker'], {'queries': 0, 'records': 0, 'seconds': 0.0})
+                stats['queries'] += 1
+                stats['records'] += len(result['records'])
+                stats['seconds'] += result['seconds']
+
+                msg = f"[{done}/{len(pending)}] '{result['query']}': {len(result['records'])} new records ({written} total)"
+                if result['error']:
+                    failed_queries[result['query']] = result['error']
+                    msg += f", failed: {result['error']}"
+                print(msg)
+                if progress_callback:
+                    progress_callback(msg)
+
+    for stats in worker_stats.values():
+        stats['records_per_second'] = stats['records'] / stats['seconds'] if stats['seconds'] else 0.0
+    manager.shutdown()
+
+    return {
+        'queries': len(queries),
+        'records': written,
+        'seconds': time.time() - started,
+        'workers': worker_stats,
+        'failed_queries': failed_queries,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scrape many Google Maps queries into one deduplicated file.')
+    parser.add_argument('queries', help='Text file with one search query per line')
+    parser.add_argument('-o', '--output', default='batch_results.csv',
+                        help='Merged file to write; .csv, .jsonl, .parquet or .sqlite3')
+    parser.add_argument('--sqlite', default=None, help='Also append the records to this SQLite database')
+    parser.add_argument('-w', '--workers', type=int, default=2, help='Number of worker processes (one browser each)')
+    parser.add_argument('--max-results', type=int, default=None, help='Global cap on records across all queries')
+    parser.add_argument('--per-query-results', type=int, default=100, help='Max results for each query')
+    parser.add_argument('--max-pages', type=int, default=5, help='Feed scroll budget for each query')
+    parser.add_argument('--cache', default=None, help='Path of a PlaceCache database to share between workers')
+    parser.add_argument('--checkpoint', default=None, help='Journal file to record progress in and resume from')
+    parser.add_argument('--country', default=None, help='Phone rules to apply, e.g. TR, IN, GB, US')
+    parser.add_argument('--rate', type=float, default=DEFAULT_RATE,
+                        help='Page loads and clicks per second across all workers (0 for no limit)')
+    parser.add_argument('--http', action='store_true',
+                        help='Read results over HTTP without rendering pages, using the browser only as a fallback')
+    args = parser.parse_args()
+
+    queries = read_queries(args.queries)
+    stats = run_batch(queries, args.output, workers=args.workers, max_results=args.max_results,
+                      per_query_results=args.per_query_results, max_pages=args.max_pages, cache_path=args.cache,
+                      checkpoint_path=args.checkpoint, rate=args.rate or None, sqlite_path=args.sqlite,
+                      country=args.country,
+                      http=args.http)
+
+    print(f"Wrote {stats['records']} records for {stats['queries']} queries to {args.output} "
+          f"in {stats['seconds']:.1f}s")
+    for pid, worker in stats['workers'].items():
+        print(f"  worker {pid}: {worker['queries']} queries, {worker['records']} records, "
+              f"{worker['records_per_second']:.2f} records/s")
+    if stats['failed_queries']:
+        print(f"{len(stats['failed_queries'])} queries failed:")
+        for query, error in stats['failed_queries'].items():
+            print(f"  '{query}': {error}")
+
+
+if __name__ == '__main__':
+    main()
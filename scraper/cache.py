@@ -0,0 +1,87 @@
+import json
+import sqlite3
+import threading
+import time
+
+
+def _key(place_id, country):
+    return f"{country}:{place_id}" if country else place_id
+
+
+class PlaceCache:
+    """On-disk cache of extracted place records, keyed by Google Maps place ID.
+
+    Places that were opened but had no mobile phone number are cached too (as a
+    ``None`` record) so they are not re-opened either. Which number a record holds,
+    and whether it has one, depends on the country's phone rules, so records are
+    stored per ``country``. Entries older than
+    ``ttl_seconds`` are treated as misses, and the least recently used entries are
+    evicted once the cache holds more than ``max_entries``.
+    """
+
+    def __init__(self, path='place_cache.sqlite3', ttl_seconds=7 * 24 * 3600, max_entries=100000):
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS places ("
+                " place_id TEXT PRIMARY KEY,"
+                " record TEXT,"
+                " fetched_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS places_accessed_at ON places (accessed_at)")
+
+    def get(self, place_id, country=None):
+        """Return ``(hit, record)``; ``record`` is None for a cached place without a mobile number."""
+        place_id = _key(place_id, country)
+        now = time.time()
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT record, fetched_at FROM places WHERE place_id = ?", (place_id,)).fetchone()
+            if row is None:
+                return False, None
+            record, fetched_at = row
+            if self.ttl_seconds and now - fetched_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM places WHERE place_id = ?", (place_id,))
+                return False, None
+            self._conn.execute("UPDATE places SET accessed_at = ? WHERE place_id = ?", (now, place_id))
+        return True, json.loads(record) if record else None
+
+    def put(self, place_id, record, country=None):
+        place_id = _key(place_id, country)
+        now = time.time()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO places (place_id, record, fetched_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (place_id, json.dumps(record) if record else None, now, now),
+            )
+            self._evict()
+
+    def purge_expired(self):
+        """Delete every expired entry; returns how many were removed."""
+        if not self.ttl_seconds:
+            return 0
+        with self._lock, self._conn:
+            cursor = self._conn.execute("DELETE FROM places WHERE fetched_at < ?", (time.time() - self.ttl_seconds,))
+            return cursor.rowcount
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM places").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def _evict(self):
+        if not self.max_entries:
+            return
+        excess = self._conn.execute("SELECT COUNT(*) FROM places").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(
+                "DELETE FROM places WHERE place_id IN"
+                " (SELECT place_id FROM places ORDER BY accessed_at LIMIT ?)", (excess,))
@@ -0,0 +1,87 @@
+import json
+import os
+import threading
+import time
+
+
+class Checkpoint:
+    """Append-only JSONL journal that lets a crashed or interrupted scrape resume.
+
+    Every handled place (with its record, or null when it had no mobile number),
+    every feed scroll step and every finished query is appended as one line and
+    fsynced, so at most the line being written is lost. Each event is a single
+    small ``write`` to a file opened in append mode, which keeps lines intact when
+    several batch worker processes share one journal.
+    """
+
+    def __init__(self, path, resume=True):
+        self.path = path
+        self._lock = threading.Lock()
+        self.visited = set()
+        self.records = {}  # query -> [(place_id, record)]
+        self.feed_results = {}  # query -> number of feed results loaded so far
+        self.done = set()
+        if resume:
+            self._load()
+        elif os.path.exists(path):
+            os.remove(path)
+
+    def place(self, query, place_id, record):
+        """Journal a place that has been handled, with its record or None."""
+        self.visited.add(place_id)
+        if record:
+            self.records.setdefault(query, []).append((place_id, record))
+        self._append({'event': 'place', 'query': query, 'place_id': place_id, 'record': record})
+
+    def feed(self, query, results):
+        if results > self.feed_results.get(query, 0):
+            self.feed_results[query] = results
+            self._append({'event': 'feed', 'query': query, 'results': results})
+
+    def finish(self, query):
+        self.done.add(query)
+        self._append({'event': 'done', 'query': query})
+
+    def records_for(self, query):
+        return list(self.records.get(query, []))
+
+    def all_records(self):
+        """Every journalled ``(query, place_id, record)``, in journal order per query."""
+        return [(query, place_id, record) for query, items in self.records.items() for place_id, record in items]
+
+    def _append(self, event):
+        event['time'] = time.time()
+        line = json.dumps(event, ensure_ascii=False) + '\n'
+        with self._lock:
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb+') as f:
+            # Terminate a half-written last line so the next event starts on a line of its own
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b'\n':
+                    f.write(b'\n')
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    # A crash can leave the last line half-written
+                    continue
+                query = event.get('query')
+                if event['event'] == 'place':
+                    self.visited.add(event['place_id'])
+                    if event['record']:
+                        self.records.setdefault(query, []).append((event['place_id'], event['record']))
+                elif event['event'] == 'feed':
+                    self.feed_results[query] = max(self.feed_results.get(query, 0), event['results'])
+                elif event['event'] == 'done':
+                    self.done.add(query)
+        print(f"Loaded checkpoint {self.path}: {len(self.visited)} places visited, "
+              f"{sum(len(items) for items in self.records.values())} records, {len(self.done)} queries done")
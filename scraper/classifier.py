@@ -0,0 +1,139 @@
+import os
+import re
+
+# Separators allowed between the digits of a phone number; str.translate drops them in one C-level pass
+PHONE_SEPARATORS = str.maketrans('', '', ' \t\n\r\xa0\u2009\u202f-()./')
+POSTAL_CODE_RE = re.compile(r'\d{5}')
+# Google Maps Plus Codes such as "W98M+J3"
+PLUS_CODE_RE = re.compile(r'[A-Z0-9]+\+[A-Z0-9]+')
+
+ENGLISH_ADDRESS_KEYWORDS = ['street', 'avenue', 'road', 'boulevard', 'lane', 'drive', 'way']
+
+
+class CountryRules:
+    """Numbering plan and address vocabulary for one country.
+
+    ``nsn_lengths`` are the allowed lengths of the national significant number
+    (the digits after the country code or trunk prefix). ``mobile_prefixes`` are the
+    leading NSN digits of mobile numbers; None accepts any number of a valid length,
+    for countries where mobiles are not distinguishable by prefix.
+    """
+
+    def __init__(self, country_code, trunk_prefix, nsn_lengths, mobile_prefixes, address_keywords):
+        self.country_code = country_code
+        self.trunk_prefix = trunk_prefix
+        self.nsn_lengths = nsn_lengths
+        self.mobile_prefixes = mobile_prefixes
+        self.address_keywords = address_keywords
+
+
+COUNTRY_RULES = {
+    'TR': CountryRules('90', '0', (10,), ('5',), [
+        'cad', 'sok', 'mah', 'no:', 'no ', 'apt', 'daire', 'kat', 'blok',
+        'cd.', 'cd ', 'sk.', 'sk ', 'mh.', 'mh ',
+    ] + ENGLISH_ADDRESS_KEYWORDS),
+    'IN': CountryRules('91', '0', (10,), ('6', '7', '8', '9'), [
+        'road', 'rd.', 'nagar', 'marg', 'sector', 'colony', 'floor', 'near ', 'opp', 'plot',
+    ] + ENGLISH_ADDRESS_KEYWORDS),
+    'GB': CountryRules('44', '0', (10,), ('7',), [
+        'close', 'court', 'crescent', 'place', 'square', 'terrace', 'unit ', 'floor',
+    ] + ENGLISH_ADDRESS_KEYWORDS),
+    'US': CountryRules('1', '', (10,), None, [
+        'st.', 'st ', 'ave', 'blvd', 'suite', 'ste ', 'hwy', 'pkwy',
+    ] + ENGLISH_ADDRESS_KEYWORDS),
+}
+
+DEFAULT_COUNTRY = os.environ.get('SCRAPER_COUNTRY', 'TR')
+
+
+class PhoneClassifier:
+    """Precompiled phone and address rules for one country.
+
+    The scalar methods classify a single text; ``classify_series`` does the same
+    for a whole pandas Series (or any array-like) in one vectorized pass and
+    normalises mobile numbers to E.164.
+    """
+
+    def __init__(self, country=DEFAULT_COUNTRY):
+        if country not in COUNTRY_RULES:
+            raise ValueError(f"No phone rules for country: {country}")
+        self.country = country
+        self.rules = rules = COUNTRY_RULES[country]
+
+        lengths = '|'.join(f"\\d{{{length}}}" for length in sorted(rules.nsn_lengths, reverse=True))
+        prefixes = '|'.join(re.escape(prefix) for prefix in rules.mobile_prefixes or [])
+        lookahead = f"(?={prefixes})" if prefixes else ''
+        nsn = f"(?P<nsn>{lookahead}(?:{lengths}))"
+        code = re.escape(rules.country_code)
+        trunk = re.escape(rules.trunk_prefix) if rules.trunk_prefix else ''
+        # After stripping separators: +CC, 00CC, CC or the trunk prefix, then a mobile NSN
+        self.mobile_re = re.compile(f"^(?:\\+{code}|00{code}|{code}|{trunk})" + nsn + "$")
+        keywords = '|'.join(re.escape(keyword) for keyword in rules.address_keywords)
+        self.address_keywords_re = re.compile(keywords)
+
+    def is_mobile_phone(self, text):
+        """Check if text is a mobile phone number under this country's numbering plan."""
+        return self._mobile_nsn(text) is not None
+
+    def to_e164(self, text):
+        """Return the mobile number in E.164 form (e.g. +905321234567), or None."""
+        nsn = self._mobile_nsn(text)
+        return f"+{self.rules.country_code}{nsn}" if nsn else None
+
+    def is_valid_phone(self, text):
+        """Check if text looks like a phone number of any kind."""
+        if not text or len(text) < 7:
+            return False
+        digit_count = sum(c.isdigit() for c in text)
+        if digit_count < 7:  # Minimum 7 digits for a phone number
+            return False
+        has_plus = '+' in text
+        has_parentheses = '(' in text and ')' in text
+        return has_plus or has_parentheses or digit_count <= 15
+
+    def looks_like_address(self, text):
+        """Check if text looks like an address rather than a phone number."""
+        if not text:
+            return False
+        return bool(self.address_keywords_re.search(text.lower())
+                    or POSTAL_CODE_RE.search(text)
+                    or PLUS_CODE_RE.search(text))
+
+    def classify_series(self, values):
+        """Classify and normalise many phone texts at once.
+
+        Returns a DataFrame indexed like ``values`` with ``is_mobile`` and ``e164``
+        columns; ``e164`` is missing where the text is not a mobile number.
+        """
+        import numpy as np
+        import pandas as pd
+
+        texts = pd.Series(values, dtype='object')
+        # Exported datasets repeat the same numbers a lot, so classify each distinct text once
+        codes, uniques = pd.factorize(texts)
+        prefix = '+' + self.rules.country_code
+        unique_e164 = np.array([None] + [self._e164_or_none(text, prefix) for text in uniques], dtype=object)
+        e164 = unique_e164[codes + 1]  # code -1 (missing value) maps to the leading None
+        return pd.DataFrame({'is_mobile': e164 != None, 'e164': e164}, index=texts.index)  # noqa: E711
+
+    def _e164_or_none(self, text, prefix):
+        nsn = self._mobile_nsn(text) if isinstance(text, str) else None
+        return prefix + nsn if nsn else None
+
+    def _mobile_nsn(self, text):
+        if not text:
+            return None
+        # Anything left besides a leading '+' and digits makes the pattern fail
+        match = self.mobile_re.match(text.translate(PHONE_SEPARATORS))
+        return match.group('nsn') if match else None
+
+
+_classifiers = {}
+
+
+def get_classifier(country=None):
+    """Return the shared classifier for ``country`` (default: $SCRAPER_COUNTRY or TR)."""
+    country = country or DEFAULT_COUNTRY
+    if country not in _classifiers:
+        _classifiers[country] = PhoneClassifier(country)
+    return _classifiers[country]
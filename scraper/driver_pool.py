@@ -0,0 +1,257 @@
+import threading
+import time
+from contextlib import contextmanager
+from queue import Queue, Empty
+
+from scraper.google_maps_scraper import GoogleMapsScraper, create_chrome_driver
+
+
+class PooledDriver:
+    """A pre-launched Chrome driver plus the usage counters the pool recycles on."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.created_at = time.time()
+        self.leases = 0
+        self.pages = 0
+
+
+class DriverPool:
+    """Keeps a set of warm headless Chrome instances that are leased out per scrape.
+
+    Drivers are health-checked before each lease and have their cookies and storage
+    cleared when returned. An instance is quit and replaced once it has served
+    ``max_pages_per_driver`` page loads or its JS heap grows past ``max_memory_mb``.
+    """
+
+    def __init__(self, size=2, max_pages_per_driver=200, max_memory_mb=None,
+                 reset_session=True, driver_factory=create_chrome_driver):
+        self.size = size
+        self.max_pages_per_driver = max_pages_per_driver
+        self.max_memory_mb = max_memory_mb
+        self.reset_session = reset_session
+        self.driver_factory = driver_factory
+
+        self._idle = Queue()
+        self._leased = {}  # id(driver) -> PooledDriver
+        self._live = 0  # Drivers that exist right now, idle or leased
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.stats = {
+            'created': 0,
+            'leases': 0,
+            'recycled': 0,
+            'health_check_failures': 0,
+            'reset_failures': 0,
+            'create_failures': 0,
+            'lease_wait_seconds': 0.0,
+            'startup_seconds': 0.0,
+        }
+
+    def start(self):
+        """Pre-launch drivers until the pool is full."""
+        while True:
+            with self._lock:
+                if self._closed or self._live >= self.size:
+                    return self
+                self._live += 1
+            entry = self._create()
+            if entry is None:
+                with self._lock:
+                    self._live -= 1
+                return self
+            self._idle.put(entry)
+
+    def lease(self, timeout=120):
+        """Take a healthy driver out of the pool, launching one if the pool is not full yet."""
+        if self._closed:
+            raise RuntimeError("Driver pool is closed")
+
+        started = time.time()
+        while True:
+            remaining = None if timeout is None else max(0, timeout - (time.time() - started))
+            entry = self._take(remaining)
+            if self._is_healthy(entry.driver):
+                break
+            print("Pooled driver failed health check, replacing it...")
+            with self._lock:
+                self.stats['health_check_failures'] += 1
+            self._discard(entry)
+
+        entry.leases += 1
+        with self._lock:
+            self._leased[id(entry.driver)] = entry
+            self.stats['leases'] += 1
+            self.stats['lease_wait_seconds'] += time.time() - started
+        return entry.driver
+
+    def release(self, driver, pages=0):
+        """Return a leased driver, recycling it if it has done enough work."""
+        with self._lock:
+            entry = self._leased.pop(id(driver), None)
+        if entry is None:
+            return
+        entry.pages += pages
+
+        if self._closed or self._needs_recycling(entry):
+            if not self._closed:
+                print(f"Recycling pooled driver after {entry.pages} pages and {entry.leases} leases")
+                with self._lock:
+                    self.stats['recycled'] += 1
+            self._discard(entry)
+            if not self._closed:
+                self.start()
+            return
+
+        if self.reset_session and not self._reset(driver):
+            with self._lock:
+                self.stats['reset_failures'] += 1
+            self._discard(entry)
+            self.start()
+            return
+
+        self._idle.put(entry)
+
+    @contextmanager
+    def driver(self, timeout=120):
+        """Lease a driver for the duration of a ``with`` block."""
+        driver = self.lease(timeout)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def scrape(self, query, max_results=100, max_pages=5, progress_callback=None, timeout=120, with_stats=False,
+               **scraper_options):
+        """Run ``GoogleMapsScraper.scrape`` on a pooled driver and hand the driver back afterwards.
+
+        Extra keyword arguments are passed on to ``GoogleMapsScraper``. With ``with_stats``
+        returns ``(csv_string, stats)``.
+        """
+        if progress_callback:
+            progress_callback("Waiting for a browser from the pool...")
+        driver = self.lease(timeout)
+        scraper = GoogleMapsScraper(driver=driver, **scraper_options)
+        try:
+            return scraper.scrape(query, max_results, max_pages, progress_callback=progress_callback,
+                                  with_stats=with_stats)
+        finally:
+            self.release(driver, pages=scraper.pages_loaded)
+
+    def iter_scrape(self, query, max_results=100, max_pages=5, progress_callback=None, timeout=120, **scraper_options):
+        """Stream records from ``GoogleMapsScraper.iter_scrape`` on a pooled driver."""
+        if progress_callback:
+            progress_callback("Waiting for a browser from the pool...")
+        driver = self.lease(timeout)
+        scraper = GoogleMapsScraper(driver=driver, **scraper_options)
+        try:
+            yield from scraper.iter_scrape(query, max_results, max_pages, progress_callback=progress_callback)
+        finally:
+            self.release(driver, pages=scraper.pages_loaded)
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = self.size
+            stats['live'] = self._live
+            stats['leased'] = len(self._leased)
+        stats['idle'] = self._idle.qsize()
+        return stats
+
+    def close(self):
+        """Quit every idle driver; leased drivers are quit when they are released."""
+        self._closed = True
+        while True:
+            try:
+                entry = self._idle.get_nowait()
+            except Empty:
+                break
+            self._discard(entry)
+
+    def _take(self, timeout):
+        try:
+            return self._idle.get_nowait()
+        except Empty:
+            pass
+
+        with self._lock:
+            can_create = self._live < self.size
+            if can_create:
+                self._live += 1
+        if can_create:
+            entry = self._create()
+            if entry is not None:
+                return entry
+            with self._lock:
+                self._live -= 1
+            raise RuntimeError("Could not launch a Chrome driver for the pool")
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except Empty:
+            raise TimeoutError(f"No pooled driver became available within {timeout} seconds")
+
+    def _create(self):
+        started = time.time()
+        try:
+            driver = self.driver_factory()
+        except Exception as e:
+            print(f"Failed to launch pooled driver: {e}")
+            with self._lock:
+                self.stats['create_failures'] += 1
+            return None
+        with self._lock:
+            self.stats['created'] += 1
+            self.stats['startup_seconds'] += time.time() - started
+        return PooledDriver(driver)
+
+    def _discard(self, entry):
+        try:
+            entry.driver.quit()
+        except Exception as e:
+            print(f"Error quitting pooled driver: {e}")
+        with self._lock:
+            self._live -= 1
+
+    def _needs_recycling(self, entry):
+        if self.max_pages_per_driver and entry.pages >= self.max_pages_per_driver:
+            return True
+        if self.max_memory_mb:
+            used_mb = self._js_heap_mb(entry.driver)
+            if used_mb is not None and used_mb >= self.max_memory_mb:
+                return True
+        return False
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _js_heap_mb(self, driver):
+        try:
+            used = driver.execute_script(
+                "return window.performance.memory ? window.performance.memory.usedJSHeapSize : null;")
+        except Exception:
+            return None
+        return used / (1024 * 1024) if used else None
+
+    def _reset(self, driver):
+        """Clear cookies, storage and extra tabs so the next lease starts from a clean session."""
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            driver.execute_cdp_cmd('Storage.clearDataForOrigin', {
+                'origin': 'https://www.google.com',
+                'storageTypes': 'all',
+            })
+            driver.get('about:blank')
+            return True
+        except Exception as e:
+            print(f"Failed to reset pooled driver session: {e}")
+            return False
@@ -0,0 +1,118 @@
+import json
+import os
+import platform
+import shutil
+import time
+
+# Where the resolved chromedriver/Chrome paths are remembered between runs
+DRIVER_CACHE_PATH = os.environ.get(
+    'SCRAPER_DRIVER_CACHE', os.path.join(os.path.expanduser('~'), '.cache', 'maps-scraper', 'chromedriver.json'))
+# Never try methods that need the network (air-gapped workers)
+OFFLINE = os.environ.get('SCRAPER_OFFLINE', '').lower() in ('1', 'true', 'yes')
+
+CHROME_PATHS = {
+    'Linux': [
+        '/usr/bin/google-chrome',
+        '/usr/bin/google-chrome-stable',
+        '/usr/bin/chromium-browser',
+        '/usr/bin/chromium',
+    ],
+    'Windows': [
+        r'C:\Program Files\Google\Chrome\Application\chrome.exe',
+        r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe',
+    ],
+}
+SYSTEM_CHROMEDRIVER_PATHS = [
+    '/usr/bin/chromedriver',
+    '/usr/lib/chromium-browser/chromedriver',
+]
+
+
+def find_chrome_binary():
+    """The first known Chrome/Chromium install for this OS, or None to let chromedriver pick."""
+    for path in CHROME_PATHS.get(platform.system(), []):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _stamp(path):
+    # Size and mtime change whenever the file is upgraded or replaced, and reading them is a local stat
+    stat = os.stat(path)
+    return [stat.st_size, int(stat.st_mtime)]
+
+
+def load_resolution(path=DRIVER_CACHE_PATH):
+    """Return the remembered resolution if its files are still there and unchanged, else None."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            resolution = json.load(f)
+        for file_path, stamp in resolution['stamps'].items():
+            if _stamp(file_path) != stamp:
+                return None
+    except (OSError, ValueError, KeyError):
+        return None
+    return resolution
+
+
+def save_resolution(method, driver_path, binary_location, path=DRIVER_CACHE_PATH):
+    resolution = {
+        'method': method,
+        'driver_path': driver_path,
+        'binary_location': binary_location,
+        'stamps': {p: _stamp(p) for p in (driver_path, binary_location) if p},
+        'resolved_at': time.time(),
+    }
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    # Write then rename, so concurrent workers never read a half-written file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(resolution, f, indent=2)
+    os.replace(tmp_path, path)
+    return resolution
+
+
+def forget_resolution(path=DRIVER_CACHE_PATH):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def driver_candidates(offline=OFFLINE):
+    """Ways of finding a chromedriver, in the order they are tried: ``(method, resolve)`` pairs.
+
+    Each ``resolve`` returns a chromedriver path or None; the ones that may download
+    something are left out when ``offline``.
+    """
+    yield 'env', lambda: os.environ.get('CHROMEDRIVER_PATH')
+    if not offline:
+        yield 'webdriver_manager_chromium', _webdriver_manager_chromium
+        yield 'webdriver_manager', _webdriver_manager
+    yield 'selenium_manager', lambda: _selenium_manager(offline)
+    yield 'system', _system_chromedriver
+
+
+def _webdriver_manager_chromium():
+    from webdriver_manager.chrome import ChromeDriverManager
+    from webdriver_manager.core.os_manager import ChromeType
+
+    return ChromeDriverManager(chrome_type=ChromeType.CHROMIUM).install()
+
+
+def _webdriver_manager():
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    return ChromeDriverManager().install()
+
+
+def _selenium_manager(offline):
+    from selenium.webdriver.common.selenium_manager import SeleniumManager
+
+    args = ['--browser', 'chrome'] + (['--offline'] if offline else [])
+    return SeleniumManager().binary_paths(args).get('driver_path')
+
+
+def _system_chromedriver():
+    for path in [shutil.which('chromedriver')] + SYSTEM_CHROMEDRIVER_PATHS:
+        if path and os.path.exists(path):
+            return path
+    return None
@@ -0,0 +1,138 @@
+import re
+
+from scraper.classifier import get_classifier
+
+MAPS_URL = 'https://www.google.com/maps'
+
+# XPaths of the details pane nodes the extraction rules look at
+DETAILS_PANE_XPATH = "//div[contains(@class, 'AeaXub')]//div[contains(@class, 'Io6YTe')]"
+INFO_TEXT_XPATH = "//div[contains(@class, 'Io6YTe')]"
+WEBSITE_XPATH = "//a[@aria-label and contains(@aria-label, 'Website')]"
+BUSINESS_NAME_XPATH = "//h1[@class='DUwDvf lfPIob']"
+PHONE_SELECTORS = [
+    "//button[contains(@aria-label, 'Phone')]",
+    "//a[contains(@aria-label, 'Phone')]",
+    "//span[contains(@aria-label, 'Phone')]",
+    "//a[contains(@href, 'tel:')]",
+    "//button[contains(@data-value, '+')]",
+]
+
+# Reads every node the extraction rules need in one WebDriver round trip.
+# Each phone selector contributes only its first match, mirroring find_element.
+PANE_SNAPSHOT_JS = """
+var phoneSelectors = arguments[0];
+function first(xpath) {
+    return document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+}
+function all(xpath) {
+    var result = document.evaluate(xpath, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    var nodes = [];
+    for (var i = 0; i < result.snapshotLength; i++) {
+        nodes.push(result.snapshotItem(i));
+    }
+    return nodes;
+}
+function text(node) {
+    return node.innerText || node.textContent || '';
+}
+function describe(node) {
+    if (!node) {
+        return null;
+    }
+    return {href: node.href || node.getAttribute('href'), text: text(node), dataValue: node.getAttribute('data-value')};
+}
+var name = first(arguments[4]);
+var website = first(arguments[3]);
+return {
+    name: name ? text(name) : null,
+    phone_candidates: phoneSelectors.map(function (xpath) { return describe(first(xpath)); }),
+    pane_texts: all(arguments[1]).map(text),
+    info_texts: all(arguments[2]).map(text),
+    website: website ? {href: website.href || website.getAttribute('href')} : null
+};
+"""
+SNAPSHOT_ARGS = (PHONE_SELECTORS, DETAILS_PANE_XPATH, INFO_TEXT_XPATH, WEBSITE_XPATH, BUSINESS_NAME_XPATH)
+
+
+# Place links carry the feature ID ("!1s0x...:0x...") and usually the Places API ID ("!19sChIJ...")
+FEATURE_ID_RE = re.compile(r'!1s(0x[0-9a-f]+:0x[0-9a-f]+)')
+PLACE_ID_RE = re.compile(r'!19s([\w-]+)')
+
+
+def place_id_from_href(href):
+    """Return a stable identifier for the place an ``a.hfpxzc`` link points to."""
+    if not href:
+        return None
+    match = FEATURE_ID_RE.search(href) or PLACE_ID_RE.search(href)
+    if match:
+        return match.group(1)
+    # Fall back to the link itself, minus the query string
+    return href.split('?')[0]
+
+
+def classify_snapshot(snapshot, classifier=None):
+    """Apply the address/phone/website rules to a pane snapshot without touching the browser.
+
+    ``snapshot`` has the shape returned by ``PANE_SNAPSHOT_JS``. Returns a dict with
+    Address, Phone and Website; Phone is 'N/A' when no mobile number was found.
+    ``classifier`` is a ``PhoneClassifier`` and defaults to the configured country.
+    """
+    classifier = classifier or get_classifier()
+    return {
+        'Address': _snapshot_address(snapshot, classifier),
+        'Phone': _snapshot_phone(snapshot, classifier),
+        'Website': snapshot['website']['href'] if snapshot.get('website') else 'N/A',
+    }
+
+
+def _snapshot_address(snapshot, classifier):
+    texts = snapshot.get('pane_texts') or []
+    for raw in texts:
+        text = raw.strip()
+        # If it looks like an address, return it
+        if classifier.looks_like_address(text) or (text and not classifier.is_valid_phone(text)):
+            return text
+    if texts:
+        return texts[0].strip()
+    return 'N/A'
+
+
+def _snapshot_phone(snapshot, classifier):
+    for candidate in snapshot.get('phone_candidates') or []:
+        if not candidate:
+            continue
+        href = candidate.get('href')
+        if href and 'tel:' in href:
+            phone = href.replace('tel:', '').strip()
+            if classifier.is_mobile_phone(phone):
+                return phone
+
+        phone_text = (candidate.get('text') or '').strip()
+        if phone_text and classifier.is_mobile_phone(phone_text):
+            return phone_text
+
+        data_value = candidate.get('dataValue')
+        if data_value and classifier.is_mobile_phone(data_value):
+            return data_value.strip()
+
+    for raw in snapshot.get('info_texts') or []:
+        text = raw.strip()
+        if classifier.is_mobile_phone(text) and not classifier.looks_like_address(text):
+            return text
+
+    return 'N/A'
+
+
+def is_valid_phone(text):
+    """Check if text looks like a phone number."""
+    return get_classifier().is_valid_phone(text)
+
+
+def is_mobile_phone(text):
+    """Check if text is a mobile phone number under the configured country's rules."""
+    return get_classifier().is_mobile_phone(text)
+
+
+def looks_like_address(text):
+    """Check if text looks like an address rather than a phone number."""
+    return get_classifier().looks_like_address(text)
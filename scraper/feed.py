@@ -0,0 +1,97 @@
+import time
+
+# Scrolls the results feed and resolves as soon as new result links appear, the
+# "You've reached the end of the list" marker shows up, or the timeout expires.
+# Falls back to the document scroller when the page has no feed container.
+FEED_SCROLL_JS = """
+var done = arguments[arguments.length - 1];
+var timeoutMs = arguments[0];
+var feed = document.querySelector('div[role="feed"]');
+var scroller = feed || document.scrollingElement || document.body;
+function count() {
+    return document.querySelectorAll('a.hfpxzc').length;
+}
+function atEnd() {
+    return !!document.querySelector('span.HlvSq');
+}
+var before = count();
+if (atEnd()) {
+    done({before: before, after: before, end: true, feed: !!feed});
+    return;
+}
+var finished = false;
+var observer = new MutationObserver(function () {
+    if (count() > before || atEnd()) {
+        finish();
+    }
+});
+var timer = setTimeout(finish, timeoutMs);
+function finish() {
+    if (finished) {
+        return;
+    }
+    finished = true;
+    observer.disconnect();
+    clearTimeout(timer);
+    done({before: before, after: count(), end: atEnd(), feed: !!feed});
+}
+observer.observe(feed || document.body, {childList: true, subtree: true});
+scroller.scrollTop = scroller.scrollHeight;
+"""
+
+
+class FeedLoader:
+    """Loads more search results by scrolling the ``div[role=feed]`` container.
+
+    Each call to ``load_more`` is one scroll step. It returns as soon as the feed grows,
+    instead of sleeping a fixed time, and records how many links the step added and
+    how long it took, also as a ``feed_scroll`` timing on ``stats`` when given.
+
+    With a ``WaitScheduler`` as ``pacing`` every step is paced, and once enough steps
+    have been seen the step timeout follows their recent latencies instead of
+    ``step_timeout``.
+    """
+
+    def __init__(self, driver, step_timeout=4.0, stats=None, pacing=None):
+        self.driver = driver
+        self.step_timeout = step_timeout
+        self.stats = stats
+        self.pacing = pacing
+        self.steps = []
+        self.reached_end = False
+        # execute_async_script gives up after the script timeout, so leave headroom over the step timeout
+        self.driver.set_script_timeout(max(step_timeout, pacing.max_timeout if pacing else 0) + 5)
+
+    def load_more(self):
+        timeout = self.step_timeout
+        if self.pacing:
+            self.pacing.pace()
+            timeout = self.pacing.timeout('feed_scroll', initial=self.step_timeout)
+        started = time.time()
+        result = self.driver.execute_async_script(FEED_SCROLL_JS, int(timeout * 1000))
+        step = {
+            'added': max(0, result['after'] - result['before']),
+            'total': result['after'],
+            'seconds': round(time.time() - started, 3),
+            'end': bool(result['end']),
+        }
+        self.steps.append(step)
+        if self.pacing:
+            # A step that neither grew the feed nor hit the end ran into its timeout
+            if step['added'] or step['end']:
+                self.pacing.record('feed_scroll', step['seconds'])
+            else:
+                self.pacing.record('feed_scroll', None, 'timed_out')
+        if self.stats:
+            self.stats.add_time('feed_scroll', step['seconds'])
+        self.reached_end = step['end']
+        print(f"Scroll step {len(self.steps)}: +{step['added']} results in {step['seconds']}s"
+              + (" (end of list)" if step['end'] else ""))
+        return step
+
+    def load_until(self, count, max_steps):
+        """Scroll until at least ``count`` result links are loaded, the list ends, or ``max_steps`` run out."""
+        for _ in range(max_steps):
+            step = self.load_more()
+            if step['total'] >= count or step['end']:
+                break
@@ -1,161 +1,321 @@
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
+# Only cheap selenium modules are imported up front; the webdriver, WebDriverWait and
+# pandas are imported where they are used, which keeps importing this module (and
+# HTTP-mode scrapes, which may never start a browser) fast
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException, StaleElementReferenceException
-from webdriver_manager.chrome import ChromeDriverManager
-import pandas as pd
-import time
+import os
 import re
+import time
 from io import StringIO
 
-class GoogleMapsScraper:
-    def __init__(self):
-        self.driver = self._init_driver()
+from scraper import driver_resolver
+from scraper.extraction import (
+    BUSINESS_NAME_XPATH, DETAILS_PANE_XPATH, INFO_TEXT_XPATH, MAPS_URL, PANE_SNAPSHOT_JS, PHONE_SELECTORS,
+    SNAPSHOT_ARGS, WEBSITE_XPATH, classify_snapshot, place_id_from_href,
+)
+from scraper.classifier import get_classifier
+from scraper.feed import FeedLoader
+from scraper.http_extractor import HttpPlaceFetcher, place_href, record_from_place
+from scraper.metrics import CommandCounter
+from scraper.network import NetworkMonitor, NetworkPolicy
+from scraper.pacing import ThrottledError, WaitScheduler
+from scraper.stats import ScrapeStats
 
-    def _init_driver(self):
-        import os
-        import platform
-        
-        options = Options()
-        options.add_argument('--headless')  # Remove or comment out this line for debugging
-        options.add_argument('--no-sandbox')
-        options.add_argument('--disable-dev-shm-usage')
-        options.add_argument('--disable-gpu')
-        options.add_argument('--disable-software-rasterizer')
-        options.add_argument('--disable-extensions')
-        options.add_argument('--disable-logging')
-        options.add_argument('--disable-infobars')
-        options.add_argument('--window-size=1920,1080')
-        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-        
-        # Set Chrome binary location based on OS
-        system = platform.system()
-        if system == 'Linux':
-            # Try common Linux Chrome paths
-            chrome_paths = [
-                '/usr/bin/google-chrome',
-                '/usr/bin/google-chrome-stable',
-                '/usr/bin/chromium-browser',
-                '/usr/bin/chromium',
-            ]
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    options.binary_location = path
-                    break
-        elif system == 'Windows':
-            # Windows Chrome paths
-            chrome_paths = [
-                r'C:\Program Files\Google\Chrome\Application\chrome.exe',
-                r'C:\Program Files (x86)\Google\Chrome\Application\chrome.exe',
-            ]
-            for path in chrome_paths:
-                if os.path.exists(path):
-                    options.binary_location = path
-                    break
-        
-        # Try ChromeDriverManager with cache bypass to get latest version
+def create_chrome_driver(network_log=False):
+    """Launch a headless Chrome driver.
+
+    The chromedriver and Chrome binary are resolved once, trying each resolution
+    method in turn, and remembered in ``driver_resolver.DRIVER_CACHE_PATH``. Later
+    launches reuse that resolution after a local file check, without any network
+    access; if the remembered driver no longer starts, resolution runs again. With
+    ``network_log`` Chrome's performance log is enabled so NetworkMonitor can
+    count requests and bytes.
+    """
+    from selenium.webdriver.chrome.options import Options
+
+    options = Options()
+    options.add_argument('--headless')  # Remove or comment out this line for debugging
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+    options.add_argument('--disable-gpu')
+    options.add_argument('--disable-software-rasterizer')
+    options.add_argument('--disable-extensions')
+    options.add_argument('--disable-logging')
+    options.add_argument('--disable-infobars')
+    options.add_argument('--window-size=1920,1080')
+    options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+    if network_log:
+        options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    resolution = driver_resolver.load_resolution()
+    if resolution:
+        if resolution['binary_location']:
+            options.binary_location = resolution['binary_location']
+        try:
+            return _launch_chrome(resolution['driver_path'], options)
+        except Exception as e:
+            print(f"Remembered chromedriver {resolution['driver_path']} failed ({e}), resolving again")
+            driver_resolver.forget_resolution()
+
+    binary_location = driver_resolver.find_chrome_binary()
+    if binary_location:
+        options.binary_location = binary_location
+    errors = []
+    for method, resolve in driver_resolver.driver_candidates():
         try:
-            # Force ChromeDriverManager to download latest version by setting cache_valid_range to 0
-            from webdriver_manager.core.os_manager import ChromeType
-            driver_path = ChromeDriverManager(
-                chrome_type=ChromeType.CHROMIUM,
-                cache_valid_range=0  # Force download latest version
-            ).install()
-            if system == 'Linux' and os.path.exists(driver_path):
+            driver_path = resolve()
+            if not driver_path:
+                continue
+            if os.name == 'posix' and os.path.exists(driver_path):
                 os.chmod(driver_path, 0o755)
-            service = Service(driver_path)
-            driver = webdriver.Chrome(service=service, options=options)
-            return driver
+            driver = _launch_chrome(driver_path, options)
         except Exception as e:
-            print(f"ChromeDriverManager with Chromium type and cache bypass failed: {e}")
-            # Try regular ChromeDriverManager with cache bypass
+            print(f"Driver resolution via {method} failed: {e}")
+            errors.append(f"{method}: {e}")
+            continue
+        driver_resolver.save_resolution(method, driver_path, binary_location)
+        print(f"Resolved chromedriver via {method}: {driver_path}")
+        return driver
+
+    error_msg = f"Failed to initialize Chrome driver. All methods failed. Errors: {'; '.join(errors) or 'no chromedriver found'}"
+    print(error_msg)
+    raise Exception(error_msg)
+
+
+def _launch_chrome(driver_path, options):
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    return webdriver.Chrome(service=Service(driver_path), options=options)
+
+
+# Collects every result link in the feed in a single WebDriver call
+HARVEST_FEED_JS = """
+return Array.from(document.querySelectorAll('a.hfpxzc')).map(function (a) {
+    var sponsored = Array.from(a.querySelectorAll('span')).some(function (span) {
+        return span.textContent.indexOf('Sponsored') !== -1;
+    });
+    return {href: a.href, name: a.getAttribute('aria-label'), sponsored: sponsored};
+});
+"""
+
+
+class GoogleMapsScraper:
+    def __init__(self, driver=None, extraction='snapshot', archive_dir=None, cache=None, checkpoint=None, lean=False,
+                 country=None, base_url=None, stats=None, http=False, pacing=None, cancel=None, network_log=None):
+        # Structured per-phase timings and counters; pass a ScrapeStats to read them while streaming
+        self.stats = stats or ScrapeStats()
+        # Lean mode blocks images, fonts, map tiles and beacons; pass True for the
+        # default NetworkPolicy or a NetworkPolicy with custom allow/deny patterns
+        self.network_policy = NetworkPolicy() if lean is True else (lean or None)
+        # Whether a Chrome the scraper starts itself records the performance log NetworkMonitor
+        # reads; on by default only in lean mode, where it shows what the block list saved
+        self.network_log = bool(self.network_policy) if network_log is None else network_log
+        # A driver handed in by the caller (e.g. leased from a DriverPool) is not quit by the scraper
+        self.owns_driver = driver is None
+        self.driver = None
+        self.network = None
+        self.network_stats = None
+        self.commands = None
+        # Seconds spent in each phase (page_load, pane_wait, ...), kept by self.stats
+        self.timings = self.stats.phases
+        # Number of page navigations made with the driver, used by DriverPool to recycle instances
+        self.pages_loaded = 0
+        # Seconds the last page load took to become usable, see _load
+        self.load_seconds = None
+        # 'snapshot' reads the details pane with one execute_script call, 'html' parses
+        # driver.page_source offline with lxml, and 'elements' uses the original
+        # per-selector find_element lookups
+        if extraction not in ('snapshot', 'html', 'elements'):
+            raise ValueError(f"Unknown extraction mode: {extraction}")
+        self.extraction = extraction
+        # When set, the HTML of every details page is saved here for later re-parsing
+        self.archive_dir = archive_dir
+        if archive_dir:
+            os.makedirs(archive_dir, exist_ok=True)
+        # WebDriver round trips spent extracting each place, for comparing extraction modes
+        self.round_trips_per_place = []
+        # One entry per feed scroll step: results added, seconds taken, end-of-list flag
+        self.feed_steps = []
+        # Optional PlaceCache; cached places are served without opening their details pane
+        self.cache = cache
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        # Optional Checkpoint journal; handled places are recorded so an interrupted run can resume
+        self.checkpoint = checkpoint
+        # Phone/address rules for the country being scraped (default: $SCRAPER_COUNTRY or TR)
+        self.classifier = get_classifier(country)
+        # Where search URLs point; benchmarks aim this at a local stand-in server
+        self.base_url = (base_url or MAPS_URL).rstrip('/')
+        # Adaptive wait timeouts, pacing between browser actions and backoff when throttled;
+        # share one WaitScheduler between scrapers to share its rate limit
+        self.pacing = pacing or WaitScheduler()
+        # Optional threading.Event; once set the scrape stops after the place it is on
+        self.cancel = cancel
+        # HTTP mode reads the data Maps embeds in its pages without a browser; pass True for a
+        # pooled HttpPlaceFetcher or a configured one. Chrome is then only started if a page
+        # cannot be parsed and the scrape has to fall back to Selenium.
+        self.http = HttpPlaceFetcher(base_url=self.base_url, pacing=self.pacing) if http is True else (http or None)
+        self.owns_http = http is True
+        if driver is not None or not self.http:
+            self._attach_driver(driver)
+
+    @property
+    def cancelled(self):
+        return self.cancel is not None and self.cancel.is_set()
+
+    def _init_driver(self):
+        return create_chrome_driver(network_log=self.network_log)
+
+    def _attach_driver(self, driver=None):
+        if driver is None:
+            with self.stats.timer('driver_init'):
+                driver = self._init_driver()
+        self.driver = driver
+        if self.network_policy:
+            self.network_policy.apply(self.driver)
+        else:
+            NetworkPolicy.clear(self.driver)
+        self.network = NetworkMonitor(self.driver)
+        self.commands = CommandCounter.attach(self.driver)
+        self.stats.track_commands(self.commands)
+
+    def _ensure_driver(self):
+        if self.driver is None:
+            print("Starting Chrome for the Selenium fallback...")
+            self._attach_driver()
+
+    def _release_driver(self):
+        if self.owns_driver and self.driver is not None:
+            self.driver.quit()
+        if self.owns_http:
+            self.http.close()
+
+    def scrape(self, query, max_results=100, max_pages=5, progress_callback=None, with_stats=False):
+        """Scrape ``query`` into a CSV string; with ``with_stats`` returns ``(csv_string, stats)``."""
+        results = list(self.iter_scrape(query, max_results, max_pages, progress_callback))
+        csv_string = self._create_csv_string(results)
+        return (csv_string, self.stats) if with_stats else csv_string
+
+    def scrape_to(self, sink, query, max_results=100, max_pages=5, progress_callback=None):
+        """Scrape ``query`` straight into ``sink`` (see ``scraper.sinks``); returns the number of records written.
+
+        Records are written as they are found, so nothing is held in memory for the
+        whole result. The sink is flushed but left open, so several queries can share it.
+        """
+        written = 0
+        for record in self.iter_scrape(query, max_results, max_pages, progress_callback):
+            sink.write(record)
+            written += 1
+        sink.flush()
+        return written
+
+    def iter_scrape(self, query, max_results=100, max_pages=5, progress_callback=None,
+                    skip_place_ids=None, with_place_ids=False):
+        """Yield each business record as soon as its details pane has been parsed.
+
+        Places whose ID is in ``skip_place_ids`` (any container supporting ``in``) are
+        not opened. With ``with_place_ids`` the generator yields ``(place_id, record)``
+        pairs instead of bare records. The driver is released when the generator
+        finishes or is closed early.
+        """
+        try:
+            for place_id, record in self._iter_scrape(query, max_results, max_pages, progress_callback, skip_place_ids):
+                yield (place_id, record) if with_place_ids else record
+        finally:
+            self._release_driver()
+
+    def _iter_scrape(self, query, max_results, max_pages, progress_callback, skip_place_ids):
+        self.cache_stats = {'hits': 0, 'misses': 0}
+
+        # Replay what a previous, interrupted run of this query already found
+        found = 0
+        if self.checkpoint:
+            for place_id, record in self.checkpoint.records_for(query)[:max_results]:
+                found += 1
+                yield place_id, record
+            if query in self.checkpoint.done or found >= max_results:
+                print(f"Resumed {found} results for '{query}' from checkpoint")
+                self.stats.finish()
+                return
+
+        if self.http:
+            if progress_callback:
+                progress_callback("Fetching Google Maps over HTTP...")
+            started = time.time()
             try:
-                driver_path = ChromeDriverManager(cache_valid_range=0).install()
-                if system == 'Linux' and os.path.exists(driver_path):
-                    os.chmod(driver_path, 0o755)
-                service = Service(driver_path)
-                driver = webdriver.Chrome(service=service, options=options)
-                return driver
-            except Exception as e2:
-                print(f"ChromeDriverManager with cache bypass failed: {e2}")
-                # Try Selenium's automatic driver management
-                try:
-                    driver = webdriver.Chrome(options=options)
-                    return driver
-                except Exception as e3:
-                    print(f"Selenium automatic driver management failed: {e3}")
-                    # Try system chromedriver if available
-                    if system == 'Linux':
-                        system_chromedriver_paths = [
-                            '/usr/bin/chromedriver',
-                            '/usr/lib/chromium-browser/chromedriver',
-                        ]
-                        for chromedriver_path in system_chromedriver_paths:
-                            if os.path.exists(chromedriver_path):
-                                try:
-                                    os.chmod(chromedriver_path, 0o755)
-                                    service = Service(chromedriver_path)
-                                    driver = webdriver.Chrome(service=service, options=options)
-                                    return driver
-                                except Exception as e4:
-                                    print(f"System chromedriver at {chromedriver_path} failed: {e4}")
-                                    continue
-                    
-                    error_msg = f"Failed to initialize Chrome driver. All methods failed. Errors: {e}, {e2}, {e3}"
-                    print(error_msg)
-                    raise Exception(error_msg)
+                places = self.http.search(query)
+            except Exception as e:
+                print(f"HTTP mode could not read the search results ({e}), falling back to the browser")
+                self.stats.count('http_fallback')
+            else:
+                self.stats.add_time('http_search', time.time() - started)
+                print(f"Found {len(places)} businesses in the search response.")
+                for place_id, record in self._iter_http_places(query, places, max_results - found, skip_place_ids):
+                    found += 1
+                    yield place_id, record
+                self._finish_scrape(query, found, progress_callback)
+                return
+
+        self._ensure_driver()
+        from selenium.webdriver.support import expected_conditions as EC
 
-    def scrape(self, query, max_results=100, max_pages=5, progress_callback=None):
         if progress_callback:
             progress_callback("Loading Google Maps...")
         
         try:
-            self.driver.get(f"https://www.google.com/maps/search/{query}")
+            # Wait for the first result link, or the h1 of a single-business page, instead of a fixed sleep
+            self._load(f"{self.base_url}/search/{query}", 'feed_load',
+                       EC.any_of(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.hfpxzc')),
+                                 EC.presence_of_element_located((By.XPATH, BUSINESS_NAME_XPATH))))
+        except TimeoutException:
+            pass  # Continue even if elements not found immediately
         except Exception as e:
             if progress_callback:
                 progress_callback(f"Error loading page: {str(e)}")
             raise
+        self.timings['page_load'].append(self.load_seconds)
 
-        wait = WebDriverWait(self.driver, 15)  # Increased timeout for Cloud
-        if progress_callback:
-            progress_callback("Waiting for page to load...")
-        # Use explicit wait instead of fixed sleep
-        try:
-            wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, 'a.hfpxzc')))
-        except TimeoutException:
-            pass  # Continue even if elements not found immediately
-
-        # Check if the business name matches the query in the h1 tag
-        try:
-            h1_element = wait.until(EC.presence_of_element_located((By.XPATH, "//h1[@class='DUwDvf lfPIob']")))
-            business_name_in_h1 = h1_element.text.strip()
-
-            if query.lower() in business_name_in_h1.lower():
-                print(f"Direct business match found: {business_name_in_h1}")
-                if progress_callback:
-                    progress_callback("Scraping single business page...")
-                csv_string = self._scrape_single_business_page()
-                self.driver.quit()
-                return csv_string
+        # Check if the business name matches the query in the h1 tag. The page is already
+        # showing either the feed or the h1, so one look is enough and a feed costs no wait
+        started = time.time()
+        h1_elements = self.driver.find_elements(By.XPATH, BUSINESS_NAME_XPATH)
+        business_name_in_h1 = h1_elements[0].text.strip() if h1_elements else ''
+        self.stats.add_time('business_check', time.time() - started)
 
-        except TimeoutException:
-            print("No h1 tag found or business name does not match the query.")
+        if business_name_in_h1 and query.lower() in business_name_in_h1.lower():
+            print(f"Direct business match found: {business_name_in_h1}")
+            if progress_callback:
+                progress_callback("Scraping single business page...")
+            record = self._scrape_single_business_page()
+            place_id = place_id_from_href(self.driver.current_url)
+            self._journal(query, place_id, record)
+            if record:
+                yield place_id, record
+            if self.checkpoint:
+                self.checkpoint.finish(query)
+            self.stats.finish(pacing=self.pacing.report())
+            return
+        print("No h1 tag found or business name does not match the query.")
 
-        results = []
-        for i in range(max_pages):  # Loop through a fixed number of pages
-            if len(results) >= max_results:
+        feed = FeedLoader(self.driver, stats=self.stats, pacing=self.pacing)
+        self.feed_steps = feed.steps
+        # Place IDs (or hrefs) already dealt with; every scroll step re-lists the whole feed
+        handled = set()
+        if self.checkpoint and self.checkpoint.feed_results.get(query):
+            # Scroll straight back to where the interrupted run had got to
+            feed.load_until(self.checkpoint.feed_results[query], max_pages)
+        for i in range(max_pages):  # Loop through at most max_pages feed scroll steps
+            if found >= max_results or self.cancelled:
                 break
 
-            page_msg = f"Scraping page {i+1}/{max_pages}... (Found {len(results)} results so far)"
+            page_msg = f"Scraping page {i+1}/{max_pages}... (Found {found} results so far)"
             print(page_msg)
             if progress_callback:
                 progress_callback(page_msg)
             
             try:
-                businesses = wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'a.hfpxzc')))
+                businesses = self.pacing.wait(self.driver, 'feed_load',
+                                              EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'a.hfpxzc')))
                 print(f"Found {len(businesses)} businesses on this page.")
                 if progress_callback:
                     progress_callback(f"Page {i+1}: Found {len(businesses)} businesses")
@@ -165,11 +325,24 @@ class GoogleMapsScraper:
                     progress_callback(f"Timeout: No businesses found on page {i+1}")
                 break
 
-            for idx, business in enumerate(businesses):
-                if len(results) >= max_results:
+            # Walk the feed by position; the list is re-read whenever the page is re-rendered
+            idx = 0
+            retried = None  # position already retried after a stale element
+            while idx < len(businesses):
+                if found >= max_results or self.cancelled:
                     break
-                    
+
+                business = businesses[idx]
+                idx += 1
+                key = None
                 try:
+                    href = business.get_attribute('href')
+                    place_id = place_id_from_href(href)
+                    key = place_id or href
+                    if key in handled:
+                        continue
+                    handled.add(key)
+
                     business_name = business.get_attribute('aria-label')
                     if not business_name:
                         continue
@@ -179,6 +352,7 @@ class GoogleMapsScraper:
                         sponsored = business.find_element(By.XPATH, ".//span[contains(text(), 'Sponsored')]")
                         if sponsored:
                             print("Skipping sponsored business...")
+                            self.stats.skip('sponsored')
                             continue
                     except NoSuchElementException:
                         pass  # No "Sponsored" label found, proceed normally
@@ -186,93 +360,389 @@ class GoogleMapsScraper:
                     # Skip businesses with "· Visited link" in the name
                     if "· Visited link" in business_name:
                         print(f"Skipping business: {business_name}")
+                        self.stats.skip('visited')
                         continue
 
-                    current_msg = f"Processing: {business_name} ({len(results)+1}/{max_results})"
+                    if ((skip_place_ids is not None and place_id in skip_place_ids)
+                            or (self.checkpoint and place_id in self.checkpoint.visited)):
+                        print(f"Skipping already scraped business: {business_name}")
+                        self.stats.skip('already_scraped')
+                        continue
+
+                    if self.cache and place_id:
+                        hit, record = self._cache_lookup(place_id)
+                        if hit:
+                            print(f"Cache hit for {business_name}")
+                            self.stats.place(business_name, place_id, 'record' if record else 'no_mobile_phone',
+                                             cached=True)
+                            self._journal(query, place_id, record)
+                            if record:
+                                found += 1
+                                yield place_id, record
+                            continue
+
+                    current_msg = f"Processing: {business_name} ({found+1}/{max_results})"
                     print(current_msg)
                     if progress_callback:
                         progress_callback(current_msg)
                     
                     print(f"Clicking on {business_name}")
+                    self.pacing.pace()
+                    started = time.time()
                     business.click()
+                    self.pages_loaded += 1
                     # Use explicit wait instead of fixed sleep - wait for business details pane to load
                     try:
-                        wait.until(EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'AeaXub')]//div[contains(@class, 'Io6YTe')]")))
+                        self.pacing.wait(self.driver, 'pane_load',
+                                         EC.presence_of_element_located((By.XPATH, DETAILS_PANE_XPATH)))
+                        pane_wait = time.time() - started
+                        self.timings['pane_wait'].append(pane_wait)
                     except TimeoutException:
                         # If pane doesn't load, skip this business
                         print(f"Pane did not load for {business_name}, skipping...")
+                        self.stats.place(business_name, place_id, 'pane_timeout', pane_wait=time.time() - started)
                         continue
 
-                    # Scrape address
-                    address = self._get_address()
-
-                    # Scrape phone number
-                    phone = self._get_phone_number()
-
-                    # Only add to results if phone number is found (not 'N/A' or empty)
-                    if phone and phone != 'N/A' and phone.strip():
-                        # Scrape website
-                        website = self._get_element_attribute("//a[@aria-label and contains(@aria-label, 'Website')]", 'href')
-
-                        results.append({'Name': business_name, 'Address': address, 'Phone': phone, 'Website': website})
-                        print(f"Scraped: {business_name}, {address}, {phone}, {website}")
-                    else:
-                        print(f"Skipped {business_name}: No mobile phone number found")
+                    record = self._extract_record(business_name, place_id, pane_wait)
+                    if self.cache and place_id:
+                        self.cache.put(place_id, record, self.classifier.country)
+                    self._journal(query, place_id, record)
+                    if record:
+                        found += 1
+                        yield place_id, record
 
                     # Go back to the list
+                    self.pacing.pace()
+                    started = time.time()
                     self.driver.execute_script("window.history.go(-1)")
                     # Use explicit wait instead of fixed sleep - wait for list to reload
                     try:
-                        wait.until(EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'a.hfpxzc')))
+                        self.pacing.wait(self.driver, 'back_navigation',
+                                         EC.presence_of_all_elements_located((By.CSS_SELECTOR, 'a.hfpxzc')))
                         # Re-locate businesses after coming back
                         businesses = self.driver.find_elements(By.CSS_SELECTOR, 'a.hfpxzc')
+                        self.stats.add_time('back_navigation', time.time() - started)
                     except TimeoutException:
                         print("List did not reload, breaking...")
                         break
 
                 except StaleElementReferenceException:
-                    print(f"Stale element reference error encountered. Retrying...")
-                    continue  # Continue to the next business
+                    handled.discard(key)
+                    if retried != idx:
+                        # The feed was re-rendered under us; read it again and retry this position once
+                        print(f"Stale element reference error encountered. Retrying...")
+                        retried = idx
+                        idx -= 1
+                        businesses = self.driver.find_elements(By.CSS_SELECTOR, 'a.hfpxzc')
+                    else:
+                        self.stats.skip('stale_element')
+                    continue
 
                 except Exception as e:
                     print(f"Error: {e}")
+                    self.stats.skip('error')
+                    continue
+
+            # Scroll the results feed to load more; max_pages is the budget of scroll steps
+            if feed.reached_end:
+                print("Reached the end of the results list.")
+                break
+            step = feed.load_more()
+            self._drain_network()
+            if self.checkpoint:
+                self.checkpoint.feed(query, step['total'])
+            if step['end'] and step['added'] == 0:
+                print("Reached the end of the results list.")
+                break
+
+        self._finish_scrape(query, found, progress_callback)
+
+    def _iter_http_places(self, query, places, max_results, skip_place_ids):
+        """Yield ``(place_id, record)`` for places parsed from an HTTP search response."""
+        found = 0
+        for place in places:
+            if found >= max_results or self.cancelled:
+                break
+            business_name = place['name']
+            href = place_href(place, self.base_url)
+            place_id = place_id_from_href(href)
+            if ((skip_place_ids is not None and place_id in skip_place_ids)
+                    or (self.checkpoint and place_id in self.checkpoint.visited)):
+                print(f"Skipping already scraped business: {business_name}")
+                self.stats.skip('already_scraped')
+                continue
+
+            if self.cache and place_id:
+                hit, record = self._cache_lookup(place_id)
+                if hit:
+                    print(f"Cache hit for {business_name}")
+                    self.stats.place(business_name, place_id, 'record' if record else 'no_mobile_phone',
+                                     cached=True)
+                    self._journal(query, place_id, record)
+                    if record:
+                        found += 1
+                        yield place_id, record
                     continue
 
-            # Scroll down to load more results
-            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-            # Reduced wait time - new results usually load quickly
-            time.sleep(2)  # Reduced from 5 to 2 seconds
+            started = time.time()
+            try:
+                if not place['phone']:
+                    # Search results can leave details out; the place's own page has them all
+                    place = self.http.place(href)
+                record = record_from_place(place, self.classifier)
+            except Exception as e:
+                print(f"HTTP mode could not read {business_name} ({e}), falling back to the browser")
+                self.stats.count('http_fallback')
+                self._ensure_driver()
+                record = self.extract_place(href, business_name, http=False)
+            else:
+                seconds = time.time() - started
+                self.stats.add_time('http_place', seconds)
+                self.stats.place(business_name, place_id, 'record' if record else 'no_mobile_phone',
+                                 http=seconds, round_trips=0)
+                if self.cache and place_id:
+                    self.cache.put(place_id, record, self.classifier.country)
+                if record:
+                    print(f"Scraped: {business_name}, {record['Address']}, {record['Phone']}, {record['Website']}")
+                else:
+                    print(f"Skipped {business_name}: No mobile phone number found")
+
+            self._journal(query, place_id, record)
+            if record:
+                found += 1
+                yield place_id, record
+
+    def _finish_scrape(self, query, found, progress_callback):
+        if self.round_trips_per_place:
+            average = sum(self.round_trips_per_place) / len(self.round_trips_per_place)
+            print(f"Extraction ({self.extraction}) used {average:.1f} WebDriver round trips per place")
+
+        if self.cache:
+            print(f"Place cache: {self.cache_stats['hits']} hits, {self.cache_stats['misses']} misses")
+
+        self._report_network()
+        self.stats.add_cache(self.cache_stats)
+        pacing = self.pacing.report()
+        if pacing['recovered'] or pacing['timed_out'] or pacing['throttled']:
+            print(f"Waits: {pacing['recovered']} recovered after their adaptive timeout, "
+                  f"{pacing['timed_out']} timed out, {pacing['throttled']} throttle pages")
+        self.stats.finish(self.network_stats, pacing)
+
+        if self.cancelled:
+            # Leave the checkpoint open so the query can be resumed
+            print(f"Scraping cancelled after {found} results.")
+            self.stats.count('cancelled')
+            if progress_callback:
+                progress_callback(f"Scraping cancelled. Found {found} results.")
+            return
+
+        if self.checkpoint:
+            self.checkpoint.finish(query)
 
         if progress_callback:
-            progress_callback(f"Scraping completed! Found {len(results)} results.")
-        
-        self.driver.quit()
-        return self._create_csv_string(results)
+            progress_callback(f"Scraping completed! Found {found} results.")
 
     def _scrape_single_business_page(self):
         """Scrape business data when only one business is listed."""
         try:
             # Scrape business details
-            business_name = self._get_element_text("//h1[@class='DUwDvf lfPIob']")
-            address = self._get_address()
-            phone = self._get_phone_number()
-            
-            # Only return result if phone number is found (not 'N/A' or empty)
-            if phone and phone != 'N/A' and phone.strip():
-                website = self._get_element_attribute("//a[@aria-label and contains(@aria-label, 'Website')]", 'href')
-
-                # Store the result in CSV format
-                result = [{'Name': business_name, 'Address': address, 'Phone': phone, 'Website': website}]
-                print(f"Scraped data: Name: {business_name} | address: {address} | phone: {phone} | website: {website}")
-                return self._create_csv_string(result)
-            else:
-                print(f"Skipped {business_name}: No mobile phone number found")
-                # Return empty CSV
-                return self._create_csv_string([])  
+            business_name = self._get_element_text(BUSINESS_NAME_XPATH)
+            return self._extract_record(business_name)
 
         except Exception as e:
             print(f"Error scraping business page: {e}")
 
+    def _extract_record(self, business_name, place_id=None, pane_wait=None):
+        """Read the open details pane; returns None when it has no mobile phone number."""
+        started = time.time()
+        commands_before = self.commands.total
+        page_source = None
+        if self.archive_dir or self.extraction == 'html':
+            page_source = self.driver.page_source
+            if self.archive_dir:
+                self._archive_page(business_name, page_source)
+
+        if self.extraction == 'snapshot':
+            details = classify_snapshot(self.driver.execute_script(PANE_SNAPSHOT_JS, *SNAPSHOT_ARGS), self.classifier)
+            address, phone = details['Address'], details['Phone']
+        elif self.extraction == 'html':
+            from scraper.html_extractor import snapshot_from_html
+            details = classify_snapshot(snapshot_from_html(page_source), self.classifier)
+            address, phone = details['Address'], details['Phone']
+        else:
+            # Scrape address
+            address = self._get_address()
+
+            # Scrape phone number
+            with self.stats.timer('phone_lookup'):
+                phone = self._get_phone_number()
+
+        record = None
+        # Only add to results if phone number is found (not 'N/A' or empty)
+        if phone and phone != 'N/A' and phone.strip():
+            # Scrape website
+            if self.extraction in ('snapshot', 'html'):
+                website = details['Website']
+            else:
+                website = self._get_element_attribute(WEBSITE_XPATH, 'href')
+            print(f"Scraped: {business_name}, {address}, {phone}, {website}")
+            record = {'Name': business_name, 'Address': address, 'Phone': phone, 'Website': website}
+        else:
+            print(f"Skipped {business_name}: No mobile phone number found")
+
+        round_trips = self.commands.total - commands_before
+        self.round_trips_per_place.append(round_trips)
+        seconds = time.time() - started
+        self.stats.add_time('extract', seconds)
+        self.stats.place(business_name, place_id, 'record' if record else 'no_mobile_phone',
+                         pane_wait=pane_wait, extract=seconds, round_trips=round_trips)
+        return record
+
+    def _archive_page(self, business_name, page_source):
+        slug = re.sub(r'[^\w]+', '-', business_name or 'place').strip('-')[:60]
+        path = os.path.join(self.archive_dir, f"{int(time.time() * 1000)}-{slug}.html")
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(page_source)
+
+    def harvest_places(self, query, max_places=None, max_pages=5, progress_callback=None, url=None):
+        """Phase one of a parallel scrape: collect place links from the results feed without opening any.
+
+        Returns a list of ``{'href': ..., 'name': ...}`` dicts in feed order, with sponsored
+        and visited entries already filtered out. ``url`` replaces the plain search URL,
+        e.g. with one pinned to a map viewport.
+        """
+        self._ensure_driver()
+        from selenium.webdriver.support import expected_conditions as EC
+
+        if progress_callback:
+            progress_callback("Loading Google Maps...")
+        try:
+            self._load(url or f"{self.base_url}/search/{query}", 'feed_load',
+                       EC.presence_of_element_located((By.CSS_SELECTOR, 'a.hfpxzc')))
+        except TimeoutException:
+            print("Timeout: No businesses found.")
+            return []
+
+        places = []
+        seen = set()
+        feed = FeedLoader(self.driver, stats=self.stats, pacing=self.pacing)
+        self.feed_steps = feed.steps
+        for i in range(max_pages):
+            if self.cancelled:
+                break
+            for entry in self.driver.execute_script(HARVEST_FEED_JS):
+                href, name = entry['href'], entry['name']
+                if not href or not name or href in seen:
+                    continue
+                seen.add(href)
+                if entry['sponsored'] or "· Visited link" in name:
+                    print(f"Skipping business: {name}")
+                    self.stats.skip('sponsored' if entry['sponsored'] else 'visited')
+                    continue
+                places.append({'href': href, 'name': name})
+
+            if progress_callback:
+                progress_callback(f"Page {i+1}: Collected {len(places)} places")
+            if max_places and len(places) >= max_places:
+                break
+            if feed.reached_end:
+                break
+            step = feed.load_more()
+            self._drain_network()
+            if step['end'] and step['added'] == 0:
+                break
+
+        return places
+
+    def extract_place(self, href, business_name, http=True):
+        """Phase two of a parallel scrape: open a place URL directly and extract its record.
+
+        In HTTP mode the place's page is read over HTTP first, and opened in the browser
+        only when it cannot be parsed; ``http=False`` goes straight to the browser.
+        """
+        place_id = place_id_from_href(href)
+        if self.cache and place_id:
+            hit, record = self._cache_lookup(place_id)
+            if hit:
+                self.stats.place(business_name, place_id, 'record' if record else 'no_mobile_phone', cached=True)
+                return record
+
+        if self.http and http:
+            started = time.time()
+            try:
+                record = record_from_place(self.http.place(href), self.classifier)
+            except Exception as e:
+                print(f"HTTP mode could not read {business_name} ({e}), falling back to the browser")
+                self.stats.count('http_fallback')
+            else:
+                seconds = time.time() - started
+                self.stats.add_time('http_place', seconds)
+                self.stats.place(business_name, place_id, 'record' if record else 'no_mobile_phone',
+                                 http=seconds, round_trips=0)
+                if self.cache and place_id:
+                    self.cache.put(place_id, record, self.classifier.country)
+                return record
+
+        self._ensure_driver()
+        from selenium.webdriver.support import expected_conditions as EC
+
+        try:
+            self._load(href, 'pane_load', EC.presence_of_element_located((By.XPATH, DETAILS_PANE_XPATH)))
+            pane_wait = self.load_seconds
+            self.timings['pane_wait'].append(pane_wait)
+        except TimeoutException:
+            print(f"Pane did not load for {business_name}, skipping...")
+            self.stats.place(business_name, place_id, 'pane_timeout', pane_wait=self.load_seconds)
+            return None
+        record = self._extract_record(business_name, place_id, pane_wait)
+        if self.cache and place_id:
+            self.cache.put(place_id, record, self.classifier.country)
+        return record
+
+    def _load(self, url, kind, condition, attempts=3):
+        """Open ``url`` and wait for ``condition``, reloading after a backoff when the page was a throttle page.
+
+        ``self.load_seconds`` is set to the time from the last ``driver.get`` until the
+        wait ended, leaving out time spent pacing, also when the wait times out.
+        """
+        for attempt in range(attempts):
+            self.pacing.pace()
+            started = time.time()
+            try:
+                self.driver.get(url)
+                self.pages_loaded += 1
+                return self.pacing.wait(self.driver, kind, condition)
+            except ThrottledError:
+                self.stats.count('throttled')
+                if attempt == attempts - 1:
+                    raise
+            finally:
+                self.load_seconds = time.time() - started
+
+    def _drain_network(self):
+        """Fold the performance log into the network counters, so Chrome doesn't buffer a whole run of it."""
+        if self.network:
+            self.network_stats = self.network.collect()
+
+    def _report_network(self):
+        self._drain_network()
+        if self.network_stats and self.network_stats['available']:
+            print(f"Network ({'lean' if self.network_policy else 'full'}): {self.network_stats['requests']} requests, "
+                  f"{self.network_stats['bytes_received'] / 1024:.0f} KiB received, "
+                  f"{self.network_stats['requests_blocked']} blocked")
+        for name, values in self.timings.items():
+            if values:
+                print(f"{name}: average {sum(values) / len(values):.2f}s over {len(values)}")
+
+    def _journal(self, query, place_id, record):
+        if self.checkpoint and place_id:
+            self.checkpoint.place(query, place_id, record)
+
+    def _cache_lookup(self, place_id):
+        hit, record = self.cache.get(place_id, self.classifier.country)
+        self.cache_stats['hits' if hit else 'misses'] += 1
+        return hit, record
+
     def _get_element_text(self, xpath):
         try:
             return self.driver.find_element(By.XPATH, xpath).text
@@ -289,7 +759,7 @@ class GoogleMapsScraper:
         """Extract address from Google Maps business page."""
         # Try to get all Io6YTe elements and find the one that looks like an address
         try:
-            all_elements = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'AeaXub')]//div[contains(@class, 'Io6YTe')]")
+            all_elements = self.driver.find_elements(By.XPATH, DETAILS_PANE_XPATH)
             for element in all_elements:
                 text = element.text.strip()
                 # If it looks like an address, return it
@@ -303,20 +773,12 @@ class GoogleMapsScraper:
             pass
         
         # Fallback to original selector
-        return self._get_element_text("//div[contains(@class, 'AeaXub')]//div[contains(@class, 'Io6YTe')]")
+        return self._get_element_text(DETAILS_PANE_XPATH)
 
     def _get_phone_number(self):
         """Extract mobile phone number from Google Maps business page."""
         # First, try specific phone number selectors (buttons/links with Phone aria-label)
-        phone_selectors = [
-            "//button[contains(@aria-label, 'Phone')]",
-            "//a[contains(@aria-label, 'Phone')]",
-            "//span[contains(@aria-label, 'Phone')]",
-            "//a[contains(@href, 'tel:')]",
-            "//button[contains(@data-value, '+')]",
-        ]
-        
-        for selector in phone_selectors:
+        for selector in PHONE_SELECTORS:
             try:
                 element = self.driver.find_element(By.XPATH, selector)
                 # Try to get href attribute if it's a link
@@ -341,7 +803,7 @@ class GoogleMapsScraper:
         # If specific selectors fail, try to find phone in Io6YTe elements
         # but filter out addresses by checking if it looks like a mobile phone number
         try:
-            all_elements = self.driver.find_elements(By.XPATH, "//div[contains(@class, 'Io6YTe')]")
+            all_elements = self.driver.find_elements(By.XPATH, INFO_TEXT_XPATH)
             for element in all_elements:
                 text = element.text.strip()
                 # Check if it's a mobile phone number (contains digits and phone-like characters, but not address-like)
@@ -353,94 +815,17 @@ class GoogleMapsScraper:
         return 'N/A'
     
     def _is_valid_phone(self, text):
-        """Check if text looks like a phone number."""
-        if not text or len(text) < 7:
-            return False
-        
-        # Remove common phone formatting characters
-        cleaned = re.sub(r'[\s\-\(\)\+]', '', text)
-        
-        # Check if it contains mostly digits
-        digit_count = sum(c.isdigit() for c in cleaned)
-        if digit_count < 7:  # Minimum 7 digits for a phone number
-            return False
-        
-        # Check if it has phone-like patterns
-        has_plus = '+' in text
-        has_parentheses = '(' in text and ')' in text
-        has_digits = any(c.isdigit() for c in text)
-        
-        # Should have digits and phone-like formatting
-        return has_digits and (has_plus or has_parentheses or (digit_count >= 7 and digit_count <= 15))
-    
+        return self.classifier.is_valid_phone(text)
+
     def _is_mobile_phone(self, text):
-        """Check if text is a mobile phone number (Turkey format: 05XX or +90 5XX)."""
-        if not text:
-            return False
-        
-        # Remove common formatting characters
-        cleaned = re.sub(r'[\s\-\(\)]', '', text)
-        
-        # Remove +90 or 0090 prefix if present
-        if cleaned.startswith('+90'):
-            cleaned = cleaned[3:]
-        elif cleaned.startswith('0090'):
-            cleaned = cleaned[4:]
-        elif cleaned.startswith('90') and len(cleaned) > 10:
-            cleaned = cleaned[2:]
-        
-        # Check if it starts with 05 (Turkey mobile prefix)
-        if cleaned.startswith('05'):
-            # Should be 10 digits (05XX XXX XX XX)
-            digits_only = re.sub(r'[^\d]', '', cleaned)
-            if len(digits_only) == 10 and digits_only.startswith('05'):
-                # Check if second digit is 0-9 (05X)
-                if len(digits_only) >= 3 and digits_only[2] in '0123456789':
-                    return True
-        
-        # Also check international format +90 5XX
-        if text.startswith('+90') or text.startswith('0090'):
-            # Extract the part after country code
-            after_country = cleaned
-            if '+' in text:
-                parts = text.split('+90')
-                if len(parts) > 1:
-                    after_country = re.sub(r'[\s\-\(\)]', '', parts[1])
-            
-            # Check if it starts with 5 and has 10 digits total
-            digits_only = re.sub(r'[^\d]', '', after_country)
-            if len(digits_only) == 10 and digits_only.startswith('5'):
-                return True
-        
-        return False
-    
+        return self.classifier.is_mobile_phone(text)
+
     def _looks_like_address(self, text):
-        """Check if text looks like an address rather than a phone number."""
-        if not text:
-            return False
-        
-        # Address indicators
-        address_keywords = ['cad', 'sok', 'mah', 'no:', 'no ', 'apt', 'daire', 'kat', 'blok', 
-                           'street', 'avenue', 'road', 'boulevard', 'lane', 'drive', 'way',
-                           'cd.', 'cd ', 'sk.', 'sk ', 'mh.', 'mh ']
-        
-        text_lower = text.lower()
-        # Check for address keywords
-        if any(keyword in text_lower for keyword in address_keywords):
-            return True
-        
-        # Check for postal code patterns (usually 5 digits at the end)
-        if re.search(r'\d{5}', text):
-            # If it has postal code and address keywords, it's likely an address
-            return True
-        
-        # If it contains "W98M+J3" like format (Google Maps Plus Code), it's an address
-        if re.search(r'[A-Z0-9]+\+[A-Z0-9]+', text):
-            return True
-        
-        return False
+        return self.classifier.looks_like_address(text)
 
     def _create_csv_string(self, results):
+        import pandas as pd
+
         df = pd.DataFrame(results)
         output = StringIO()
         df.to_csv(output, index=False)
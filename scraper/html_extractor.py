@@ -0,0 +1,100 @@
+import argparse
+import glob
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+from lxml import html as lxml_html
+
+from scraper.extraction import (
+    BUSINESS_NAME_XPATH, DETAILS_PANE_XPATH, INFO_TEXT_XPATH, PHONE_SELECTORS, WEBSITE_XPATH,
+    classify_snapshot,
+)
+from scraper.classifier import get_classifier
+
+
+def snapshot_from_html(page_html):
+    """Build the same pane snapshot ``PANE_SNAPSHOT_JS`` returns, from raw HTML instead of a live page."""
+    tree = lxml_html.fromstring(page_html)
+
+    def first(xpath):
+        nodes = tree.xpath(xpath)
+        return nodes[0] if nodes else None
+
+    def describe(node):
+        if node is None:
+            return None
+        return {'href': node.get('href'), 'text': _node_text(node), 'dataValue': node.get('data-value')}
+
+    name = first(BUSINESS_NAME_XPATH)
+    website = first(WEBSITE_XPATH)
+    return {
+        'name': _node_text(name) if name is not None else None,
+        'phone_candidates': [describe(first(xpath)) for xpath in PHONE_SELECTORS],
+        'pane_texts': [_node_text(node) for node in tree.xpath(DETAILS_PANE_XPATH)],
+        'info_texts': [_node_text(node) for node in tree.xpath(INFO_TEXT_XPATH)],
+        'website': {'href': website.get('href')} if website is not None else None,
+    }
+
+
+def extract_from_html(page_html, business_name=None, country=None):
+    """Extract a Name/Address/Phone/Website record from a saved details page.
+
+    The business name is read from the page's h1 unless given. Returns None when the
+    page has no mobile phone number, like ``GoogleMapsScraper`` does.
+    """
+    snapshot = snapshot_from_html(page_html)
+    details = classify_snapshot(snapshot, get_classifier(country))
+    name = business_name or snapshot['name'] or 'N/A'
+    if details['Phone'] == 'N/A' or not details['Phone'].strip():
+        return None
+    return {'Name': name, 'Address': details['Address'], 'Phone': details['Phone'], 'Website': details['Website']}
+
+
+def extract_from_file(path, country=None):
+    with open(path, encoding='utf-8') as f:
+        return extract_from_html(f.read(), country=country)
+
+
+def extract_files(paths, processes=None, country=None):
+    """Re-parse archived pages in bulk across a process pool; returns records in input order."""
+    paths = list(paths)
+    extract = partial(extract_from_file, country=country)
+    if processes == 1 or len(paths) < 2:
+        records = [extract(path) for path in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            records = list(executor.map(extract, paths, chunksize=16))
+    return [record for record in records if record]
+
+
+def _node_text(node):
+    # Collapse whitespace per line, roughly matching what WebElement.text returns
+    lines = (' '.join(line.split()) for line in node.text_content().splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def main():
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description='Re-extract business records from saved Google Maps pages.')
+    parser.add_argument('inputs', nargs='+', help='HTML files, directories or glob patterns')
+    parser.add_argument('-o', '--output', default='extracted.csv', help='CSV file to write')
+    parser.add_argument('-p', '--processes', type=int, default=None, help='Worker processes (default: CPU count)')
+    parser.add_argument('-c', '--country', default=None, help='Phone rules to apply, e.g. TR, IN, GB, US')
+    args = parser.parse_args()
+
+    paths = []
+    for pattern in args.inputs:
+        if os.path.isdir(pattern):
+            paths.extend(sorted(glob.glob(os.path.join(pattern, '*.html'))))
+        else:
+            paths.extend(sorted(glob.glob(pattern)))
+
+    records = extract_files(paths, processes=args.processes, country=args.country)
+    pd.DataFrame(records, columns=['Name', 'Address', 'Phone', 'Website']).to_csv(args.output, index=False)
+    print(f"Extracted {len(records)} records from {len(paths)} pages into {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+import json
+import re
+import time
+from urllib.parse import quote
+
+from scraper.classifier import get_classifier
+from scraper.extraction import MAPS_URL, classify_snapshot
+from scraper.pacing import is_throttled
+
+# Maps pages embed their data as ``window.APP_INITIALIZATION_STATE=[...]``. Slot 3 holds
+# JSON strings behind an XSSI guard: the search results at [3][2], a place at [3][6].
+APP_STATE_RE = re.compile(r'APP_INITIALIZATION_STATE\s*=\s*')
+XSSI_PREFIX = ")]}'"
+SEARCH_PAYLOAD_SLOT = 2
+PLACE_PAYLOAD_SLOT = 6
+
+# Positions inside one place array. The layout is undocumented and read the same way
+# by other Maps scrapers; anything missing simply comes back as None.
+PLACE_FIELDS = {
+    'name': (11,),
+    'address': (39,),
+    'address_lines': (2,),
+    'website': (7, 0),
+    'phone': (178, 0, 0),
+    'feature_id': (10,),
+    'place_id': (78,),
+}
+SEARCH_RESULTS = (0, 1)  # list of results in the search payload; each result's place array is at [14]
+SEARCH_RESULT_PLACE = (14,)
+PLACE_PAGE_PLACE = (6,)
+
+
+class HttpParseError(Exception):
+    """Raised when a response has no embedded Maps data we can read (consent page, new layout, ...)."""
+
+
+def create_http_session(pool_size=10, retries=2):
+    """A keep-alive requests session with a connection pool sized for ``pool_size`` concurrent fetches."""
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size,
+                          max_retries=Retry(total=retries, backoff_factor=0.5,
+                                            status_forcelist=[429, 500, 502, 503, 504]))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) '
+                      'Chrome/120.0.0.0 Safari/537.36',
+        'Accept-Language': 'en-US,en;q=0.9',
+    })
+    # Skip the EU cookie consent interstitial, which carries no place data
+    session.cookies.set('CONSENT', 'YES+', domain='.google.com')
+    return session
+
+
+def parse_app_state(page_html):
+    """Return the decoded ``APP_INITIALIZATION_STATE`` array of a Maps page, or raise HttpParseError."""
+    match = APP_STATE_RE.search(page_html)
+    if not match:
+        raise HttpParseError('No APP_INITIALIZATION_STATE in the page')
+    try:
+        state, _ = json.JSONDecoder().raw_decode(page_html, match.end())
+    except ValueError as e:
+        raise HttpParseError(f'Unreadable APP_INITIALIZATION_STATE: {e}')
+    return state
+
+
+def _payload(state, slot):
+    raw = _get(state, (3, slot))
+    if not isinstance(raw, str):
+        raise HttpParseError(f'No payload in APP_INITIALIZATION_STATE[3][{slot}]')
+    if raw.startswith(XSSI_PREFIX):
+        raw = raw[len(XSSI_PREFIX):]
+    try:
+        return json.loads(raw)
+    except ValueError as e:
+        raise HttpParseError(f'Unreadable payload in APP_INITIALIZATION_STATE[3][{slot}]: {e}')
+
+
+def _get(data, path):
+    for index in path:
+        if not isinstance(data, list) or index >= len(data):
+            return None
+        data = data[index]
+    return data
+
+
+def place_from_array(data):
+    """Pick the fields the scraper needs out of one place array."""
+    place = {field: _get(data, path) for field, path in PLACE_FIELDS.items()}
+    if not place['address'] and isinstance(place['address_lines'], list):
+        place['address'] = ', '.join(line for line in place['address_lines'] if isinstance(line, str))
+    return place
+
+
+def places_from_search(page_html):
+    """Places embedded in a search response, in feed order. A single-business search yields one place."""
+    state = parse_app_state(page_html)
+    try:
+        payload = _payload(state, SEARCH_PAYLOAD_SLOT)
+    except HttpParseError:
+        # Searches that resolve to one business come back as a place page
+        return [place_from_page(page_html)]
+    results = _get(payload, SEARCH_RESULTS)
+    if not isinstance(results, list):
+        raise HttpParseError('No result list in the search payload')
+    places = []
+    for result in results:
+        data = _get(result, SEARCH_RESULT_PLACE)
+        if isinstance(data, list):
+            place = place_from_array(data)
+            if place['name']:
+                places.append(place)
+    return places
+
+
+def place_from_page(page_html):
+    data = _get(_payload(parse_app_state(page_html), PLACE_PAYLOAD_SLOT), PLACE_PAGE_PLACE)
+    if not isinstance(data, list):
+        raise HttpParseError('No place in the place payload')
+    place = place_from_array(data)
+    if not place['name']:
+        raise HttpParseError('Place payload has no name')
+    return place
+
+
+def place_href(place, base_url=MAPS_URL):
+    """A place URL carrying the feature ID, so place_id_from_href gives the same ID as for a feed link."""
+    href = f"{base_url.rstrip('/')}/place/{quote(place['name'])}"
+    if place['feature_id']:
+        href += f"/data=!4m2!3m1!1s{place['feature_id']}"
+    return href
+
+
+def record_from_place(place, classifier=None):
+    """Apply the scraper's address/phone/website rules to a parsed place.
+
+    The place is laid out as a pane snapshot and run through ``classify_snapshot``,
+    so records match what the browser extraction modes produce. Returns None when
+    the place has no mobile phone number.
+    """
+    phone = place['phone']
+    snapshot = {
+        'name': place['name'],
+        'phone_candidates': [{'href': None, 'text': phone, 'dataValue': None}] if phone else [],
+        'pane_texts': [place['address']] if place['address'] else [],
+        'info_texts': [text for text in (place['address'], phone) if text],
+        'website': {'href': place['website']} if place['website'] else None,
+    }
+    details = classify_snapshot(snapshot, classifier or get_classifier())
+    if details['Phone'] == 'N/A' or not details['Phone'].strip():
+        return None
+    return {'Name': place['name'], 'Address': details['Address'], 'Phone': details['Phone'],
+            'Website': details['Website']}
+
+
+class HttpPlaceFetcher:
+    """Fetches Maps search and place pages over pooled keep-alive HTTP and parses their embedded data.
+
+    No browser is involved. Only the results embedded in the first search response
+    are available this way (Maps loads the rest of the feed with further XHRs as it
+    is scrolled). Methods raise HttpParseError when a response cannot be parsed, which
+    callers use to fall back to Selenium. With a ``WaitScheduler`` as ``pacing``
+    requests are paced, and throttle or consent responses are retried after its
+    backoff up to ``attempts`` times.
+    """
+
+    def __init__(self, session=None, base_url=MAPS_URL, timeout=10, pool_size=10, pacing=None, attempts=3):
+        self.session = session or create_http_session(pool_size)
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.pacing = pacing
+        self.attempts = attempts
+        self.requests = 0
+
+    def search(self, query):
+        return places_from_search(self._get(f"{self.base_url}/search/{quote(query)}"))
+
+    def place(self, href):
+        return place_from_page(self._get(href))
+
+    def _get(self, url):
+        for _ in range(self.attempts if self.pacing else 1):
+            if self.pacing:
+                self.pacing.pace()
+            self.requests += 1
+            started = time.time()
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()
+            if not is_throttled(response.url, response.text[:2000]):
+                if self.pacing:
+                    self.pacing.record('http_request', time.time() - started)
+                return response.text
+            if self.pacing:
+                self.pacing.throttle(response.url)
+        raise HttpParseError(f'Throttle or consent page instead of {url}')
+
+    def close(self):
+        self.session.close()
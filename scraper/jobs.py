@@ -0,0 +1,267 @@
+import os
+import queue
+import threading
+import time
+import traceback
+import uuid
+from collections import deque
+
+from scraper.pacing import WaitScheduler
+from scraper.parallel import scrape_parallel
+from scraper.sinks import open_exports, remove_exports
+from scraper.stats import ScrapeStats
+
+ACTIVE_STATES = ('queued', 'running')
+
+
+class JobQueueFull(Exception):
+    """Raised by JobQueue.submit when the queue already holds ``max_queued`` jobs."""
+
+
+class Job:
+    """One background scrape: its parameters, status, progress events and result files."""
+
+    def __init__(self, query, max_results=100, max_pages=5, workers=1, sqlite_path=None, scraper_options=None,
+                 max_events=200, live_rows=50):
+        self.id = uuid.uuid4().hex[:12]
+        self.query = query
+        self.max_results = max_results
+        self.max_pages = max_pages
+        self.workers = workers
+        self.sqlite_path = sqlite_path
+        self.scraper_options = scraper_options or {}
+        # queued -> running -> done / failed / cancelled
+        self.status = 'queued'
+        self.events = deque(maxlen=max_events)  # (timestamp, message)
+        self.latest = deque(maxlen=live_rows)  # the most recent records, for a live view
+        self.count = 0
+        self.paths = {}  # format -> result file
+        self.error = None
+        self.stats = None  # (ScrapeStats.to_dict(), ScrapeStats.to_prometheus()) once finished
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+
+    @property
+    def active(self):
+        return self.status in ACTIVE_STATES
+
+    @property
+    def progress(self):
+        if not self.active:
+            return 1.0
+        return min(1.0, self.count / self.max_results) if self.max_results else 0.0
+
+    @property
+    def last_event(self):
+        return self.events[-1][1] if self.events else None
+
+    def event(self, message):
+        self.events.append((time.time(), message))
+
+    def cancel(self):
+        """Ask the job to stop; a queued job never starts, a running one stops after its current place."""
+        self.cancel_event.set()
+        if self.status == 'queued':
+            self.status = 'cancelled'
+            self.finished = time.time()
+        self.event('Cancel requested')
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'query': self.query,
+            'status': self.status,
+            'records': self.count,
+            'progress': self.progress,
+            'last_event': self.last_event,
+            'error': self.error,
+            'files': dict(self.paths),
+            'created': self.created,
+            'started': self.started,
+            'finished': self.finished,
+        }
+
+
+class JobQueue:
+    """Runs scrapes in the background on a fixed number of worker threads.
+
+    Submitted jobs wait in a queue of at most ``max_queued`` entries and are run in
+    order by ``workers`` threads, which lease their browsers from the shared
+    ``DriverPool``. CPU and memory use therefore stay bounded however many users
+    submit work. A job reserves all the drivers it will lease before it starts, so
+    concurrent parallel jobs never each hold part of the pool while waiting for the
+    rest. All jobs share the ``pacing`` WaitScheduler, so its rate limit and
+    latency history cover every browser the queue drives. Every job writes its
+    records to result files under ``export_dir`` as they are found. Jobs are looked up by ID, so any session can follow or
+    collect them. Only the ``keep_jobs`` most recent finished jobs and their files
+    are kept.
+    """
+
+    def __init__(self, pool, workers=2, max_queued=20, export_dir='exports', keep_jobs=100, cache=None, pacing=None):
+        self.pool = pool
+        self.workers = workers
+        self.export_dir = export_dir
+        self.keep_jobs = keep_jobs
+        self.cache = cache
+        self.pacing = pacing or WaitScheduler()
+        self._drivers_free = pool.size  # drivers not reserved by a running job
+        self._drivers_changed = threading.Condition()
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._jobs = {}  # job ID -> Job, in submission order
+        self._lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker, name=f'scrape-job-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def submit(self, query, max_results=100, max_pages=5, workers=1, sqlite_path=None, **scraper_options):
+        """Queue a scrape and return its Job; raises JobQueueFull when the queue is full.
+
+        With ``workers`` above 1 the job runs ``scrape_parallel``, which leases that many
+        drivers and cannot resume from a ``checkpoint``. Extra keyword arguments go to
+        every ``GoogleMapsScraper`` of the job.
+        """
+        if workers > 1 and scraper_options.get('checkpoint'):
+            raise ValueError("A checkpoint needs a single worker; parallel jobs cannot resume")
+        job = Job(query, max_results, max_pages, workers, sqlite_path, scraper_options)
+        with self._lock:
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                raise JobQueueFull(f"{self._queue.maxsize} jobs are already waiting; try again later")
+            self._jobs[job.id] = job
+        job.event('Queued')
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job and job.active:
+            job.cancel()
+        return job
+
+    def position(self, job):
+        """How many queued jobs are ahead of ``job``, or None once it has left the queue."""
+        if job.status != 'queued':
+            return None
+        with self._lock:
+            waiting = [other for other in self._jobs.values() if other.status == 'queued']
+        return waiting.index(job) if job in waiting else None
+
+    def get_stats(self):
+        jobs = self.jobs()
+        return {
+            'workers': self.workers,
+            'queued': sum(1 for job in jobs if job.status == 'queued'),
+            'running': sum(1 for job in jobs if job.status == 'running'),
+            'finished': sum(1 for job in jobs if not job.active),
+            'max_queued': self._queue.maxsize,
+            'drivers_free': self._drivers_free,
+        }
+
+    def shutdown(self, cancel=True):
+        """Stop the workers after their current job, cancelling running and queued jobs when ``cancel``."""
+        if cancel:
+            for job in self.jobs():
+                if job.active:
+                    job.cancel()
+        for _ in self._threads:
+            # Blocks while the queue is full; workers drain it quickly once jobs are cancelled
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _worker(self):
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            try:
+                if job.status == 'queued':
+                    self._run(job)
+            finally:
+                self._forget_old()
+
+    def _reserve_drivers(self, job, count):
+        """Block until ``count`` drivers are free and reserve them; False if the job was cancelled meanwhile."""
+        with self._drivers_changed:
+            if self._drivers_free < count:
+                job.event(f"Waiting for {count} browsers...")
+            while self._drivers_free < count:
+                if job.cancel_event.is_set():
+                    return False
+                self._drivers_changed.wait(timeout=1.0)
+            self._drivers_free -= count
+        return True
+
+    def _free_drivers(self, count):
+        with self._drivers_changed:
+            self._drivers_free += count
+            self._drivers_changed.notify_all()
+
+    def _run(self, job):
+        job.status = 'running'
+        job.started = time.time()
+        # A parallel job leases up to this many drivers at once, so it reserves them all up front
+        drivers = max(1, min(job.workers, self.pool.size))
+        if not self._reserve_drivers(job, drivers):
+            job.status = 'cancelled'
+            job.finished = time.time()
+            return
+        job.event('Starting scraping...')
+        stats = ScrapeStats()
+        try:
+            sink, job.paths = open_exports(os.path.join(self.export_dir, job.id), sqlite_path=job.sqlite_path)
+            with sink:
+                if drivers > 1:
+                    # Records reach the sink in feed order once the run ends; show them live as they resolve
+                    counted = threading.Lock()
+
+                    def show(record):
+                        with counted:
+                            job.latest.append(record)
+                            job.count = min(job.count + 1, job.max_results)
+
+                    job.count = scrape_parallel(self.pool, job.query, job.max_results, job.max_pages,
+                                                workers=drivers, progress_callback=job.event, cache=self.cache,
+                                                stats=stats, pacing=self.pacing, sink=sink,
+                                                cancel=job.cancel_event, record_callback=show,
+                                                **job.scraper_options)
+                else:
+                    for record in self.pool.iter_scrape(job.query, job.max_results, job.max_pages,
+                                                        progress_callback=job.event, cache=self.cache, stats=stats,
+                                                        pacing=self.pacing, cancel=job.cancel_event,
+                                                        **job.scraper_options):
+                        sink.write(record)
+                        job.latest.append(record)
+                        job.count += 1
+            job.status = 'cancelled' if job.cancel_event.is_set() else 'done'
+        except Exception as e:
+            job.status = 'failed'
+            job.error = f"Error during scraping: {str(e)}\n\nTraceback:\n{traceback.format_exc()}"
+            job.event(f"Failed: {e}")
+        finally:
+            self._free_drivers(drivers)
+            job.stats = (stats.to_dict(), stats.to_prometheus())
+            job.finished = time.time()
+
+    def _forget_old(self):
+        with self._lock:
+            finished = [job for job in self._jobs.values() if not job.active]
+            for job in finished[:max(0, len(finished) - self.keep_jobs)]:
+                del self._jobs[job.id]
+                remove_exports(job.paths)
@@ -0,0 +1,32 @@
+from collections import Counter
+
+
+class CommandCounter:
+    """Counts WebDriver commands (each one an HTTP round trip to chromedriver) sent by a driver.
+
+    Selenium routes every driver and element command through ``driver.execute``, so wrapping
+    that single method on the instance is enough to see all of them.
+    """
+
+    def __init__(self):
+        self.total = 0
+        self.by_command = Counter()
+
+    @classmethod
+    def attach(cls, driver):
+        """Install a counter on ``driver``, or return the one already installed (e.g. on a pooled driver)."""
+        counter = getattr(driver, '_command_counter', None)
+        if counter is not None:
+            return counter
+
+        counter = cls()
+        execute = driver.execute
+
+        def counting_execute(driver_command, params=None):
+            counter.total += 1
+            counter.by_command[driver_command] += 1
+            return execute(driver_command, params)
+
+        driver.execute = counting_execute
+        driver._command_counter = counter
+        return counter
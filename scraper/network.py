@@ -0,0 +1,156 @@
+import json
+from collections import Counter
+from fnmatch import fnmatch
+
+# Request classes that are not needed to read names, phones and websites.
+# Patterns use the CDP Network.setBlockedURLs wildcard syntax ('*' matches anything).
+LEAN_BLOCK_PATTERNS = [
+    # Images and photos
+    '*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.ico*', '*.svg*',
+    '*lh3.googleusercontent.com/*', '*lh5.googleusercontent.com/*', '*streetviewpixels-pa.googleapis.com/*',
+    # Fonts
+    '*.woff*', '*.ttf*', '*fonts.gstatic.com/*', '*fonts.googleapis.com/*',
+    # Map tiles and satellite imagery
+    '*/maps/vt?*', '*/maps/vt/*', '*/kh/v=*', '*khms*.google.com/*',
+    # Analytics, logging and ad beacons
+    '*google-analytics.com/*', '*googletagmanager.com/*', '*doubleclick.net/*',
+    '*/gen_204*', '*/log204*', '*/csi?*', '*/log?format=*', '*play.google.com/log*',
+]
+
+
+class NetworkPolicy:
+    """Lean mode configuration: which request URLs the browser should not load.
+
+    ``block`` patterns are added to the defaults; any default or added pattern that
+    matches one of the ``allow`` patterns is switched off again, e.g.
+    ``allow=['*.svg*']`` keeps SVG icons loading.
+    """
+
+    def __init__(self, block=None, allow=None, use_defaults=True):
+        self.block = (list(LEAN_BLOCK_PATTERNS) if use_defaults else []) + list(block or [])
+        self.allow = list(allow or [])
+
+    def blocked_patterns(self):
+        return [pattern for pattern in self.block
+                if not any(fnmatch(pattern, allowed) for allowed in self.allow)]
+
+    def apply(self, driver):
+        """Install the block list on ``driver`` through the DevTools protocol."""
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': self.blocked_patterns()})
+        driver._network_policy = self
+
+    @staticmethod
+    def clear(driver):
+        """Undo a previously applied policy, e.g. on a pooled driver leased by a non-lean scrape."""
+        if getattr(driver, '_network_policy', None) is not None:
+            driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': []})
+            driver._network_policy = None
+
+
+class NetworkMonitor:
+    """Counts requests, transferred bytes and blocked requests from Chrome's performance log.
+
+    Only works on drivers launched with ``create_chrome_driver(network_log=True)``;
+    otherwise ``collect`` reports the stats as unavailable. Chrome buffers the log
+    until it is read, so long runs should call ``collect`` as they go; the counters
+    accumulate across calls.
+    """
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.available = True
+        self.requests = 0
+        self.bytes_received = 0
+        self.blocked = 0
+        self.blocked_by_type = Counter()
+        self.bytes_by_type = Counter()
+        self._types = {}  # requestId -> resource type
+        # Drop whatever earlier runs on this driver left in the log
+        try:
+            driver.get_log('performance')
+        except Exception:
+            self.available = False
+
+    def collect(self):
+        """Drain the performance log into the counters; returns the current stats."""
+        if self.available:
+            try:
+                entries = self.driver.get_log('performance')
+            except Exception:
+                self.available = False
+                entries = []
+            for entry in entries:
+                self._handle(json.loads(entry['message'])['message'])
+        return self.stats()
+
+    def stats(self):
+        return {
+            'available': self.available,
+            'requests': self.requests,
+            'bytes_received': self.bytes_received,
+            'requests_blocked': self.blocked,
+            'blocked_by_type': dict(self.blocked_by_type),
+            'bytes_by_type': dict(self.bytes_by_type),
+        }
+
+    def _handle(self, message):
+        method, params = message.get('method'), message.get('params', {})
+        if method == 'Network.requestWillBeSent':
+            self.requests += 1
+            self._types[params['requestId']] = params.get('type', 'Other')
+        elif method == 'Network.loadingFinished':
+            size = int(params.get('encodedDataLength', 0))
+            self.bytes_received += size
+            self.bytes_by_type[self._types.pop(params['requestId'], 'Other')] += size
+        elif method == 'Network.loadingFailed':
+            resource_type = self._types.pop(params['requestId'], params.get('type', 'Other'))
+            if params.get('blockedReason'):
+                self.blocked += 1
+                self.blocked_by_type[resource_type] += 1
+
+
+def estimate_savings(lean_stats, baseline_stats, lean_pages, baseline_pages):
+    """Compare a lean run against a normal run, per page loaded, to estimate what lean mode saves."""
+    if not lean_pages or not baseline_pages:
+        return None
+    lean_bytes = lean_stats['bytes_received'] / lean_pages
+    baseline_bytes = baseline_stats['bytes_received'] / baseline_pages
+    lean_requests = (lean_stats['requests'] - lean_stats['requests_blocked']) / lean_pages
+    baseline_requests = baseline_stats['requests'] / baseline_pages
+    return {
+        'bytes_saved_per_page': baseline_bytes - lean_bytes,
+        'requests_saved_per_page': baseline_requests - lean_requests,
+        'bytes_saved_ratio': 1 - lean_bytes / baseline_bytes if baseline_bytes else 0.0,
+    }
+
+
+def compare_lean(query, max_results=10, max_pages=1):
+    """Scrape ``query`` once normally and once in lean mode and print what lean mode changed."""
+    from scraper.google_maps_scraper import GoogleMapsScraper
+
+    runs = {}
+    for name, lean in (('full', False), ('lean', True)):
+        scraper = GoogleMapsScraper(lean=lean, network_log=True)
+        scraper.scrape(query, max_results, max_pages)
+        runs[name] = scraper
+
+    for name, scraper in runs.items():
+        line = f"{name}: {scraper.network_stats['requests']} requests, {scraper.network_stats['bytes_received'] / 1024:.0f} KiB"
+        for timing, values in scraper.timings.items():
+            if values:
+                line += f", {timing} {sum(values) / len(values):.2f}s"
+        print(line)
+
+    savings = estimate_savings(runs['lean'].network_stats, runs['full'].network_stats,
+                               runs['lean'].pages_loaded, runs['full'].pages_loaded)
+    if savings:
+        print(f"Lean mode saves {savings['bytes_saved_per_page'] / 1024:.0f} KiB and "
+              f"{savings['requests_saved_per_page']:.0f} requests per page ({savings['bytes_saved_ratio']:.0%} of bytes)")
+    return savings
+
+
+if __name__ == '__main__':
+    import sys
+
+    compare_lean(' '.join(sys.argv[1:]) or 'restaurants in Kadikoy')
@@ -0,0 +1,233 @@
+import random
+import threading
+import time
+from collections import Counter, deque
+
+from selenium.common.exceptions import TimeoutException
+
+# Browser actions (page loads, clicks, scroll steps) allowed per second, and how many may burst
+DEFAULT_RATE = 2.0
+DEFAULT_BURST = 4
+
+# Kinds of wait the scraper does; each gets its own latency history and timeout
+WAIT_KINDS = [
+    'feed_load',  # search page until the first result link (or a single business's h1) shows up
+    'pane_load',  # clicking a result (or opening its URL) until the details pane is there
+    'back_navigation',  # history.go(-1) until the result links are there again
+    'feed_scroll',  # one feed scroll step until new results are appended
+]
+
+# Where Google sends clients it is throttling or asking for cookie consent
+THROTTLE_URL_MARKERS = ['/sorry/', 'consent.google.']
+THROTTLE_TEXT_MARKERS = ['unusual traffic', 'detected unusual', 'Before you continue to Google']
+
+
+class ThrottledError(TimeoutException):
+    """A wait ended on a throttle or consent page rather than the page that was expected."""
+
+
+def is_throttled(url, page_text=''):
+    """True when a response looks like Google's rate-limit (``/sorry/``) or consent interstitial."""
+    url = url or ''
+    return (any(marker in url for marker in THROTTLE_URL_MARKERS)
+            or any(marker in (page_text or '') for marker in THROTTLE_TEXT_MARKERS))
+
+
+class TokenBucket:
+    """Allows ``rate`` actions per second on average and bursts of up to ``burst``; thread-safe."""
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Take a token, sleeping until one is available; returns the seconds slept."""
+        if not self.rate:
+            return 0.0
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            # A negative balance is a debt the caller pays off by sleeping, outside the lock
+            delay = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+        return delay
+
+
+class LatencyWindow:
+    """The most recent ``size`` latencies of one wait kind."""
+
+    def __init__(self, size=50):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds):
+        self.samples.append(seconds)
+
+    def percentile(self, q):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q / 100))]
+
+
+class WaitScheduler:
+    """Adaptive timeouts, request pacing and throttle backoff for the Selenium scrapers.
+
+    Every wait kind (see ``WAIT_KINDS``) keeps a window of recent latencies. Once
+    ``min_samples`` have been seen its timeout becomes ``p95 * headroom + padding``,
+    kept between ``min_timeout`` and ``max_timeout``; until then ``initial_timeout``
+    is used. The timeout is the wait's deadline: a wait that outlives it gets one
+    grace period of the same length, never running past ``max_timeout`` in all, and
+    is counted as ``recovered`` if it then succeeds or ``timed_out`` if it does not.
+    A failing wait therefore lasts at most twice its adaptive timeout, and never
+    longer than a fixed ``initial_timeout`` wait would.
+
+    ``pace`` is called before every browser action and draws from a token bucket of
+    ``rate`` actions per second (None for no limit). When a throttle or consent page
+    is seen, pacing also waits out an exponential backoff that doubles with every
+    consecutive detection. One scheduler may be shared by the scrapers of a parallel
+    run, which then share its rate.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE, burst=DEFAULT_BURST, initial_timeout=15.0, min_timeout=3.0,
+                 max_timeout=15.0, headroom=2.0, padding=1.0, min_samples=5, backoff_base=5.0, max_backoff=300.0):
+        self.bucket = TokenBucket(rate, burst)
+        self.initial_timeout = initial_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.headroom = headroom
+        self.padding = padding
+        self.min_samples = min_samples
+        self.backoff_base = backoff_base
+        self.max_backoff = max_backoff
+        self.latencies = {kind: LatencyWindow() for kind in WAIT_KINDS}
+        self.outcomes = {kind: Counter() for kind in WAIT_KINDS}  # ok / recovered / timed_out per kind
+        self.throttled = 0
+        self.consecutive_throttles = 0
+        self.backoff_until = 0.0
+        self.paced_seconds = 0.0
+        self.backoff_seconds = 0.0
+        self._lock = threading.Lock()
+
+    def timeout(self, kind, initial=None):
+        """Seconds to wait for ``kind`` before treating it as slow.
+
+        ``initial`` replaces ``initial_timeout`` while too few latencies have been seen.
+        """
+        with self._lock:
+            window = self.latencies.setdefault(kind, LatencyWindow())
+            if len(window.samples) < self.min_samples:
+                return self.initial_timeout if initial is None else initial
+            adaptive = window.percentile(95) * self.headroom + self.padding
+        return round(min(self.max_timeout, max(self.min_timeout, adaptive)), 2)
+
+    def record(self, kind, seconds, outcome='ok'):
+        with self._lock:
+            if seconds is not None:
+                self.latencies.setdefault(kind, LatencyWindow()).add(seconds)
+            self.outcomes.setdefault(kind, Counter())[outcome] += 1
+            if outcome != 'timed_out':
+                # The page answered normally, so the backoff streak is over
+                self.consecutive_throttles = 0
+
+    def wait(self, driver, kind, condition, recover=True):
+        """``WebDriverWait(driver, timeout).until(condition)`` with the adaptive timeout for ``kind``.
+
+        Raises TimeoutException like WebDriverWait when the condition is not met, or
+        ThrottledError when the page turned out to be a throttle or consent page. With
+        ``recover`` a wait that outlives the adaptive timeout gets one more timeout's
+        worth of time, within ``max_timeout`` in all; pass False for waits whose
+        timeout is an expected answer.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        timeout = self.timeout(kind)
+        started = time.time()
+        try:
+            result = WebDriverWait(driver, timeout).until(condition)
+        except TimeoutException:
+            # One grace period as long as the timeout itself, capped so the whole wait fits max_timeout
+            remaining = min(timeout, self.max_timeout - timeout)
+            if self.check_throttle(driver):
+                self.record(kind, None, 'timed_out')
+                raise ThrottledError(f"Throttled while waiting for {kind}")
+            if not recover or remaining <= 0:
+                self.record(kind, None, 'timed_out')
+                raise
+            try:
+                result = WebDriverWait(driver, remaining).until(condition)
+            except TimeoutException:
+                self.record(kind, None, 'timed_out')
+                raise
+            self.record(kind, time.time() - started, 'recovered')
+            return result
+        self.record(kind, time.time() - started)
+        return result
+
+    def pace(self):
+        """Block until the next browser action may run; returns the seconds waited."""
+        waited = 0.0
+        with self._lock:
+            backoff = max(0.0, self.backoff_until - time.monotonic())
+        if backoff:
+            time.sleep(backoff)
+            waited += backoff
+        waited += self.bucket.acquire()
+        with self._lock:
+            self.paced_seconds += waited
+        return waited
+
+    def check_throttle(self, driver):
+        """Look for a throttle or consent page in ``driver``; backs off and returns True when found."""
+        try:
+            url = driver.current_url
+            text = driver.execute_script("return document.body ? document.body.innerText.slice(0, 2000) : ''")
+        except Exception:
+            return False
+        if is_throttled(url, text):
+            self.throttle(url)
+            return True
+        return False
+
+    def throttle(self, url=None):
+        """Start (or extend) an exponential backoff after a throttle or consent response."""
+        with self._lock:
+            self.throttled += 1
+            self.consecutive_throttles += 1
+            backoff = min(self.max_backoff, self.backoff_base * 2 ** (self.consecutive_throttles - 1))
+            # Jitter keeps parallel workers from all retrying at the same moment
+            backoff *= random.uniform(0.75, 1.25)
+            self.backoff_until = max(self.backoff_until, time.monotonic() + backoff)
+            self.backoff_seconds += backoff
+        print(f"Throttled{f' at {url}' if url else ''}, backing off {backoff:.1f}s")
+
+    def report(self):
+        with self._lock:
+            waits = {}
+            for kind, outcomes in self.outcomes.items():
+                if not outcomes:
+                    continue
+                window = self.latencies[kind]
+                waits[kind] = {
+                    'ok': outcomes['ok'],
+                    'recovered': outcomes['recovered'],
+                    'timed_out': outcomes['timed_out'],
+                    'p50': window.percentile(50),
+                    'p95': window.percentile(95),
+                }
+            report = {
+                'waits': waits,
+                'recovered': sum(outcomes['recovered'] for outcomes in self.outcomes.values()),
+                'timed_out': sum(outcomes['timed_out'] for outcomes in self.outcomes.values()),
+                'throttled': self.throttled,
+                'paced_seconds': round(self.paced_seconds, 3),
+                'backoff_seconds': round(self.backoff_seconds, 3),
+            }
+        for kind in waits:
+            waits[kind]['timeout'] = self.timeout(kind)
+        return report
@@ -0,0 +1,148 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from scraper.google_maps_scraper import GoogleMapsScraper
+from scraper.pacing import WaitScheduler
+from scraper.stats import ScrapeStats
+
+
+class _OrderedResults:
+    """Collects per-place outcomes by feed index and knows when the ordered prefix is complete."""
+
+    def __init__(self, total, max_results):
+        self.total = total
+        self.max_results = max_results
+        self.outcomes = {}  # feed index -> record or None
+        self.next_index = 0
+        self.done = False
+        self.lock = threading.Lock()
+
+    def claim(self):
+        """Hand out the next place index, or None once no more work is needed."""
+        with self.lock:
+            if self.done or self.next_index >= self.total:
+                return None
+            index = self.next_index
+            self.next_index += 1
+            return index
+
+    def store(self, index, record):
+        with self.lock:
+            self.outcomes[index] = record
+            # Stop handing out work once the contiguous prefix already holds max_results records
+            found = 0
+            i = 0
+            while i in self.outcomes:
+                if self.outcomes[i]:
+                    found += 1
+                i += 1
+            if found >= self.max_results:
+                self.done = True
+            return found
+
+    def records(self):
+        ordered = [self.outcomes[i] for i in sorted(self.outcomes)]
+        return [record for record in ordered if record][:self.max_results]
+
+
+def scrape_parallel(pool, query, max_results=100, max_pages=5, workers=4, progress_callback=None, cache=None,
+                    stats=None, pacing=None, sink=None, cancel=None, record_callback=None, **scraper_options):
+    """Two-phase scrape: harvest the place links from the feed, then extract details concurrently.
+
+    Each worker leases its own driver from ``pool`` and opens place URLs directly, so there
+    is no click/``history.go(-1)`` round trip per business. A single Selenium session can only
+    drive one tab at a time, so concurrency comes from separate pooled drivers. Records come
+    back in feed order, exactly as a serial run would produce them, capped at ``max_results``.
+    Places found in ``cache`` (a ``PlaceCache``) are not opened at all. Timings and
+    counters of the harvest and of every worker are collected on ``stats`` when given.
+    All workers share one ``WaitScheduler``, so ``pacing`` limits their combined rate.
+    With a ``sink`` (see ``scraper.sinks``) the records are written to it and the number
+    written is returned instead of a CSV string. Setting the ``cancel`` event stops the
+    harvest and the workers after the place each is on. ``record_callback`` is called with
+    every record as soon as it is extracted, for a live view; records arrive there in the
+    order the workers finish them, not in feed order. Extra keyword arguments (``lean``,
+    ``country``, ``http``, ...) go to every ``GoogleMapsScraper``; a ``checkpoint`` is not
+    supported, since places are not journalled in feed order.
+    """
+    if scraper_options.get('checkpoint'):
+        raise ValueError("scrape_parallel does not support checkpoints; run with one worker to resume")
+    stats = stats or ScrapeStats()
+    pacing = pacing or WaitScheduler()
+    driver = pool.lease()
+    # The feed is always read in the browser; HTTP mode only applies to the place pages
+    harvester = GoogleMapsScraper(driver=driver, stats=stats, pacing=pacing, cancel=cancel,
+                                  **dict(scraper_options, http=False))
+    try:
+        # Places without a mobile number are dropped later, so harvest the whole page budget
+        places = harvester.harvest_places(query, max_pages=max_pages, progress_callback=progress_callback)
+    finally:
+        pool.release(driver, pages=harvester.pages_loaded)
+
+    print(f"Harvested {len(places)} places, extracting details with {workers} workers")
+    if progress_callback:
+        progress_callback(f"Harvested {len(places)} places, extracting details...")
+
+    records = extract_parallel(pool, places, max_results, workers, progress_callback, cache, stats, pacing, cancel,
+                               record_callback, **scraper_options)
+    if progress_callback:
+        if cancel is not None and cancel.is_set():
+            progress_callback(f"Scraping cancelled. Found {len(records)} results.")
+        else:
+            progress_callback(f"Scraping completed! Found {len(records)} results.")
+    if sink is not None:
+        sink.write_many(records)
+        sink.flush()
+        return len(records)
+    return harvester._create_csv_string(records)
+
+
+def extract_parallel(pool, places, max_results=None, workers=4, progress_callback=None, cache=None, stats=None,
+                     pacing=None, cancel=None, record_callback=None, **scraper_options):
+    """Phase two: open harvested ``places`` on pooled drivers and return their records in input order.
+
+    ``record_callback`` is called with each record as it is extracted, from the worker
+    threads. Extra keyword arguments go to every worker's ``GoogleMapsScraper``. A worker that
+    cannot lease a driver drops out and leaves its share to the others; only when none
+    of them gets one is the lease error raised.
+    """
+    stats = stats or ScrapeStats()
+    pacing = pacing or WaitScheduler()
+    results = _OrderedResults(len(places), max_results or len(places))
+
+    def worker():
+        try:
+            driver = pool.lease()
+        except Exception as e:
+            print(f"Worker could not lease a driver, continuing with fewer workers: {e}")
+            return e
+        scraper = GoogleMapsScraper(driver=driver, cache=cache, stats=stats, pacing=pacing, cancel=cancel,
+                                    **scraper_options)
+        try:
+            while not scraper.cancelled:
+                index = results.claim()
+                if index is None:
+                    return None
+                place = places[index]
+                try:
+                    record = scraper.extract_place(place['href'], place['name'])
+                except Exception as e:
+                    print(f"Error: {e}")
+                    record = None
+                found = results.store(index, record)
+                if record and record_callback:
+                    record_callback(record)
+                if progress_callback:
+                    progress_callback(f"Processed: {place['name']} ({found}/{results.max_results})")
+        finally:
+            stats.add_cache(scraper.cache_stats)
+            scraper._release_driver()  # closes its HTTP session; the leased driver goes back to the pool
+            pool.release(driver, pages=scraper.pages_loaded)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(worker) for _ in range(max(1, min(workers, len(places))))]
+        lease_errors = [error for error in (future.result() for future in futures) if error is not None]
+    if places and len(lease_errors) == len(futures):
+        raise lease_errors[0]
+
+    stats.finish(pacing=pacing.report())
+    return results.records()
@@ -0,0 +1,257 @@
+import csv
+import json
+import os
+import sqlite3
+
+RECORD_COLUMNS = ['Name', 'Address', 'Phone', 'Website']
+
+
+class RecordSink:
+    """Writes records to ``path`` in chunks of ``chunk_size`` as they arrive.
+
+    Only one chunk is ever held in memory, however many records are written.
+    Records are laid out by ``columns``; missing keys are written empty and extra
+    keys are dropped. With ``append`` an existing file is added to instead of
+    replaced. Sinks are context managers and flush what is left on ``close``.
+    """
+
+    def __init__(self, path, columns=RECORD_COLUMNS, chunk_size=500, append=False):
+        self.path = path
+        self.columns = list(columns)
+        self.chunk_size = chunk_size
+        self.append = append
+        self.count = 0
+        self._chunk = []
+        self._closed = False
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def write(self, record):
+        self._chunk.append([record.get(column) for column in self.columns])
+        self.count += 1
+        if len(self._chunk) >= self.chunk_size:
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if self._chunk:
+            self._write_chunk(self._chunk)
+            self._chunk = []
+
+    def close(self):
+        if not self._closed:
+            self.flush()
+            self._close()
+            self._closed = True
+
+    def _write_chunk(self, rows):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvSink(RecordSink):
+    def __init__(self, path, columns=RECORD_COLUMNS, chunk_size=500, append=False):
+        super().__init__(path, columns, chunk_size, append)
+        has_header = append and os.path.exists(path) and os.path.getsize(path) > 0
+        self._file = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+        self._writer = csv.writer(self._file)
+        if not has_header:
+            self._writer.writerow(self.columns)
+            self._file.flush()
+
+    def _write_chunk(self, rows):
+        self._writer.writerows(rows)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class JsonlSink(RecordSink):
+    """One JSON object per line, so a partial file is still readable line by line."""
+
+    def __init__(self, path, columns=RECORD_COLUMNS, chunk_size=500, append=False):
+        super().__init__(path, columns, chunk_size, append)
+        self._file = open(path, 'a' if append else 'w', encoding='utf-8')
+
+    def _write_chunk(self, rows):
+        self._file.writelines(json.dumps(dict(zip(self.columns, row)), ensure_ascii=False) + '\n' for row in rows)
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class ParquetSink(RecordSink):
+    """Parquet with one row group per chunk; every column is a nullable string.
+
+    Needs the optional pyarrow dependency. Parquet files cannot be appended to, so
+    ``append`` is not supported.
+    """
+
+    def __init__(self, path, columns=RECORD_COLUMNS, chunk_size=5000, append=False):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("ParquetSink needs pyarrow: pip install pyarrow")
+        if append:
+            raise ValueError("Parquet files cannot be appended to")
+        super().__init__(path, columns, chunk_size, append)
+        self._pa = pa
+        self._schema = pa.schema([(column, pa.string()) for column in self.columns])
+        self._writer = pq.ParquetWriter(path, self._schema)
+
+    def _write_chunk(self, rows):
+        arrays = [self._pa.array([None if row[i] is None else str(row[i]) for row in rows], type=self._pa.string())
+                  for i in range(len(self.columns))]
+        self._writer.write_table(self._pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def _close(self):
+        self._writer.close()
+
+
+class SqliteSink(RecordSink):
+    """Writes records to ``table`` in a SQLite database, one transaction per chunk.
+
+    The table is created with a TEXT column per record column if it does not exist.
+    Like the file sinks, its existing rows are deleted first unless ``append`` is set.
+    """
+
+    def __init__(self, path, columns=RECORD_COLUMNS, chunk_size=500, append=False, table='records'):
+        super().__init__(path, columns, chunk_size, append)
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.table = table
+        self._conn = sqlite3.connect(path)
+        quoted = [f'"{column}"' for column in self.columns]
+        self._insert = f'INSERT INTO "{table}" ({", ".join(quoted)}) VALUES ({", ".join("?" for _ in quoted)})'
+        with self._conn:
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" ({", ".join(f"{q} TEXT" for q in quoted)})')
+            if not append:
+                self._conn.execute(f'DELETE FROM "{table}"')
+
+    def _write_chunk(self, rows):
+        with self._conn:
+            self._conn.executemany(self._insert, rows)
+
+    def _close(self):
+        self._conn.close()
+
+
+class MultiSink:
+    """Writes every record to several sinks, e.g. a CSV file and a SQLite table."""
+
+    def __init__(self, sinks):
+        self.sinks = list(sinks)
+
+    @property
+    def count(self):
+        return self.sinks[0].count if self.sinks else 0
+
+    def write(self, record):
+        for sink in self.sinks:
+            sink.write(record)
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        for sink in self.sinks:
+            sink.flush()
+
+    def close(self):
+        for sink in self.sinks:
+            sink.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+SINK_FORMATS = {
+    'csv': CsvSink,
+    'jsonl': JsonlSink,
+    'parquet': ParquetSink,
+    'sqlite': SqliteSink,
+}
+EXTENSION_FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+    '.parquet': 'parquet',
+    '.sqlite': 'sqlite',
+    '.sqlite3': 'sqlite',
+    '.db': 'sqlite',
+}
+
+
+def open_sink(path, format=None, columns=RECORD_COLUMNS, **options):
+    """Open the sink for ``format`` (csv, jsonl, parquet or sqlite), guessed from the extension of ``path`` if not given."""
+    if format is None:
+        format = EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower())
+        if format is None:
+            raise ValueError(f"Cannot tell the output format of {path}; use one of {', '.join(EXTENSION_FORMATS)}")
+    if format not in SINK_FORMATS:
+        raise ValueError(f"Unknown output format: {format}")
+    return SINK_FORMATS[format](path, columns, **options)
+
+
+def open_exports(base_path, formats=('csv', 'jsonl', 'parquet'), sqlite_path=None, columns=RECORD_COLUMNS):
+    """Open one file per format at ``base_path`` + extension behind a MultiSink.
+
+    Parquet is skipped when pyarrow is not installed. With ``sqlite_path`` records are
+    also appended to its ``records`` table. Returns ``(sink, paths)``, where ``paths``
+    maps each format to its file.
+    """
+    sinks = {}
+    for format in formats:
+        try:
+            sinks[format] = open_sink(f"{base_path}.{format}", format, columns)
+        except ImportError:
+            if format != 'parquet':
+                raise
+    paths = {format: sink.path for format, sink in sinks.items()}
+    if sqlite_path:
+        sinks['sqlite'] = SqliteSink(sqlite_path, columns, append=True)
+    return MultiSink(sinks.values()), paths
+
+
+def remove_exports(paths):
+    for path in paths.values():
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def read_records(path, columns=RECORD_COLUMNS, table='records'):
+    """Load a sink's output back as a DataFrame with nullable string columns, without type guessing."""
+    import pandas as pd
+
+    format = EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower())
+    if format == 'csv':
+        df = pd.read_csv(path, dtype='string', keep_default_na=False)
+    elif format == 'jsonl':
+        df = pd.read_json(path, lines=True, dtype=False)
+    elif format == 'parquet':
+        df = pd.read_parquet(path)
+    elif format == 'sqlite':
+        with sqlite3.connect(path) as conn:
+            df = pd.read_sql_query(f'SELECT * FROM "{table}"', conn)
+    else:
+        raise ValueError(f"Cannot tell the format of {path}")
+    return df.reindex(columns=list(columns)).astype('string')
@@ -0,0 +1,205 @@
+import json
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Phases a scrape is broken into, in the order they happen
+PHASES = [
+    'driver_init',  # launching Chrome (only for scrapers that start their own driver)
+    'page_load',  # driver.get of the search page until the first result link shows up
+    'business_check',  # looking for the h1 that marks a single-business page
+    'pane_wait',  # clicking a result (or opening its URL) until the details pane is there
+    'extract',  # reading name, address, phone and website from the open pane
+    'phone_lookup',  # the phone selector cascade, in 'elements' extraction mode
+    'back_navigation',  # history.go(-1) back to the feed until the result links are there again
+    'feed_scroll',  # one feed scroll step
+    'http_search',  # HTTP mode: fetching and parsing the search response
+    'http_place',  # HTTP mode: reading one place, from the search payload or its own page
+]
+
+
+class ScrapeStats:
+    """Structured timings and counters for one scrape.
+
+    Each phase collects the seconds every occurrence took, each skipped business
+    is counted by reason (sponsored, visited, already_scraped, no_mobile_phone,
+    pane_timeout, stale_element, error), and every place handled gets a row with
+    its timings, WebDriver round trips and outcome. WebDriver commands are counted
+    from the ``CommandCounter`` of each driver passed to ``track_commands``, and the
+    ``WaitScheduler`` report (adaptive waits recovered or timed out, throttling) is
+    kept as ``pacing``. One instance may be shared by the scrapers of a parallel run.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.finished = None
+        self.phases = {phase: [] for phase in PHASES}
+        self.skips = Counter()
+        self.counters = Counter()
+        self.places = []
+        self.records = 0
+        self.cache = {'hits': 0, 'misses': 0}
+        self.network = None
+        self.pacing = None
+        self._command_counters = []  # (CommandCounter, by_command when tracking started)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def timer(self, phase):
+        started = time.time()
+        try:
+            yield
+        finally:
+            self.add_time(phase, time.time() - started)
+
+    def add_time(self, phase, seconds):
+        with self._lock:
+            self.phases.setdefault(phase, []).append(seconds)
+
+    def skip(self, reason):
+        with self._lock:
+            self.skips[reason] += 1
+
+    def count(self, name, amount=1):
+        """Bump a free-form event counter, e.g. ``http_fallback``."""
+        with self._lock:
+            self.counters[name] += amount
+
+    def place(self, name, place_id, outcome, **timings):
+        """Record a handled place; ``outcome`` is 'record' or a skip reason.
+
+        Places served from the place cache are passed with ``cached=True``.
+        """
+        row = dict({'name': name, 'place_id': place_id, 'outcome': outcome}, **timings)
+        with self._lock:
+            self.places.append(row)
+            if outcome == 'record':
+                self.records += 1
+            else:
+                self.skips[outcome] += 1
+
+    def track_commands(self, counter):
+        with self._lock:
+            self._command_counters.append((counter, Counter(counter.by_command)))
+
+    def add_cache(self, cache_stats):
+        with self._lock:
+            for key in self.cache:
+                self.cache[key] += cache_stats.get(key, 0)
+
+    def finish(self, network=None, pacing=None):
+        self.finished = time.time()
+        if network is not None:
+            self.network = network
+        if pacing is not None:
+            self.pacing = pacing
+
+    def commands(self):
+        """WebDriver commands sent by the tracked drivers since tracking started, by command name."""
+        commands = Counter()
+        for counter, baseline in self._command_counters:
+            commands.update(counter.by_command)
+            commands.subtract(baseline)
+        return +commands
+
+    def phase_summary(self):
+        summary = {}
+        for phase, values in self.phases.items():
+            if values:
+                ordered = sorted(values)
+                summary[phase] = {
+                    'count': len(values),
+                    'total': sum(values),
+                    'mean': sum(values) / len(values),
+                    'p50': ordered[len(ordered) // 2],
+                    'p90': ordered[min(len(ordered) - 1, int(len(ordered) * 0.9))],
+                    'max': ordered[-1],
+                }
+        return summary
+
+    def to_dict(self):
+        commands = self.commands()
+        opened = [place for place in self.places if not place.get('cached')]
+        return {
+            'seconds': (self.finished or time.time()) - self.started,
+            'records': self.records,
+            'places_handled': len(self.places),
+            'places_opened': len(opened),
+            'phases': self.phase_summary(),
+            'skips': dict(self.skips),
+            'counters': dict(self.counters),
+            'webdriver_commands': sum(commands.values()),
+            'webdriver_commands_by_type': dict(commands),
+            'round_trips_per_place': (sum(place.get('round_trips', 0) for place in opened) / len(opened)
+                                      if opened else None),
+            'cache': dict(self.cache),
+            'network': self.network,
+            'pacing': self.pacing,
+            'places': list(self.places),
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent, ensure_ascii=False)
+
+    def to_prometheus(self, prefix='maps_scraper'):
+        """Render the counters in the Prometheus text exposition format."""
+        stats = self.to_dict()
+        lines = [
+            f"# HELP {prefix}_phase_seconds Time spent in each scrape phase.",
+            f"# TYPE {prefix}_phase_seconds summary",
+        ]
+        for phase, summary in stats['phases'].items():
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{phase}"}} {summary["total"]:.6f}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{phase}"}} {summary["count"]}')
+        lines += [
+            f"# HELP {prefix}_skipped_total Businesses skipped, by reason.",
+            f"# TYPE {prefix}_skipped_total counter",
+        ]
+        lines += [f'{prefix}_skipped_total{{reason="{reason}"}} {count}' for reason, count in stats['skips'].items()]
+        lines += [
+            f"# HELP {prefix}_events_total Other scrape events, by name.",
+            f"# TYPE {prefix}_events_total counter",
+        ]
+        lines += [f'{prefix}_events_total{{event="{name}"}} {count}' for name, count in stats['counters'].items()]
+        lines += [
+            f"# HELP {prefix}_webdriver_commands_total WebDriver commands sent, by command.",
+            f"# TYPE {prefix}_webdriver_commands_total counter",
+        ]
+        lines += [f'{prefix}_webdriver_commands_total{{command="{command}"}} {count}'
+                  for command, count in stats['webdriver_commands_by_type'].items()]
+        if stats['pacing']:
+            lines += [
+                f"# HELP {prefix}_waits_total Page waits, by kind and outcome (ok, recovered, timed_out).",
+                f"# TYPE {prefix}_waits_total counter",
+            ]
+            for kind, waits in stats['pacing']['waits'].items():
+                lines += [f'{prefix}_waits_total{{kind="{kind}",outcome="{outcome}"}} {waits[outcome]}'
+                          for outcome in ('ok', 'recovered', 'timed_out')]
+            lines += [
+                f"# HELP {prefix}_wait_timeout_seconds Current adaptive timeout, by wait kind.",
+                f"# TYPE {prefix}_wait_timeout_seconds gauge",
+            ]
+            lines += [f'{prefix}_wait_timeout_seconds{{kind="{kind}"}} {waits["timeout"]}'
+                      for kind, waits in stats['pacing']['waits'].items()]
+            lines += [
+                f"# HELP {prefix}_throttled_total Throttle or consent pages seen.",
+                f"# TYPE {prefix}_throttled_total counter",
+                f"{prefix}_throttled_total {stats['pacing']['throttled']}",
+            ]
+        lines += [
+            f"# HELP {prefix}_records_total Records scraped.",
+            f"# TYPE {prefix}_records_total counter",
+            f"{prefix}_records_total {stats['records']}",
+            f"# HELP {prefix}_places_opened_total Details panes opened.",
+            f"# TYPE {prefix}_places_opened_total counter",
+            f"{prefix}_places_opened_total {stats['places_opened']}",
+            f"# HELP {prefix}_cache_lookups_total Place cache lookups, by result.",
+            f"# TYPE {prefix}_cache_lookups_total counter",
+            f'{prefix}_cache_lookups_total{{result="hit"}} {stats["cache"]["hits"]}',
+            f'{prefix}_cache_lookups_total{{result="miss"}} {stats["cache"]["misses"]}',
+            f"# HELP {prefix}_scrape_seconds Wall time of the scrape.",
+            f"# TYPE {prefix}_scrape_seconds gauge",
+            f"{prefix}_scrape_seconds {stats['seconds']:.6f}",
+        ]
+        return '\n'.join(lines) + '\n'
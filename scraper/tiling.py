@@ -0,0 +1,236 @@
+import argparse
+import math
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import quote
+
+from scraper.extraction import MAPS_URL, place_id_from_href
+
+# A results feed stops after roughly 120 entries; a tile that returns this many is
+# assumed to have more places than the feed could show
+DEFAULT_SATURATION = 100
+# Width of the browser window, which sets how much map a zoom level shows
+VIEWPORT_WIDTH_PX = 1920
+
+
+class Tile:
+    """A lat/lng box searched as one map viewport."""
+
+    def __init__(self, south, west, north, east, depth=0):
+        self.south = south
+        self.west = west
+        self.north = north
+        self.east = east
+        self.depth = depth
+
+    @property
+    def center(self):
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+
+    @property
+    def zoom(self):
+        """The Maps zoom level at which the viewport is about as wide as the tile."""
+        span = max(self.east - self.west, 1e-6)
+        # At zoom z the world is 256 * 2**z pixels wide
+        return round(min(21.0, max(3.0, math.log2(360 * VIEWPORT_WIDTH_PX / (256 * span)))), 1)
+
+    @property
+    def area(self):
+        return (self.north - self.south) * (self.east - self.west)
+
+    def contains(self, lat, lng):
+        return self.south <= lat < self.north and self.west <= lng < self.east
+
+    def split(self):
+        """The four quadrants of this tile, one level deeper."""
+        lat, lng = self.center
+        depth = self.depth + 1
+        return [
+            Tile(self.south, self.west, lat, lng, depth),
+            Tile(self.south, lng, lat, self.east, depth),
+            Tile(lat, self.west, self.north, lng, depth),
+            Tile(lat, lng, self.north, self.east, depth),
+        ]
+
+    def search_url(self, query, base_url=MAPS_URL):
+        lat, lng = self.center
+        return f"{base_url.rstrip('/')}/search/{quote(query)}/@{lat:.6f},{lng:.6f},{self.zoom}z"
+
+    def __repr__(self):
+        return f"Tile({self.south:.5f}, {self.west:.5f}, {self.north:.5f}, {self.east:.5f}, depth={self.depth})"
+
+
+def parse_bounds(text):
+    """Parse ``"south,west,north,east"`` into a tuple of floats."""
+    south, west, north, east = (float(part) for part in text.split(','))
+    if south >= north or west >= east:
+        raise ValueError(f"Bounds must be south,west,north,east with south < north and west < east: {text}")
+    return south, west, north, east
+
+
+def plan_grid(bounds, rows=4, cols=4):
+    """Split ``bounds`` (south, west, north, east) into a ``rows`` x ``cols`` grid of tiles."""
+    south, west, north, east = bounds
+    lat_step = (north - south) / rows
+    lng_step = (east - west) / cols
+    return [Tile(south + r * lat_step, west + c * lng_step, south + (r + 1) * lat_step, west + (c + 1) * lng_step)
+            for r in range(rows) for c in range(cols)]
+
+
+class TilePlanner:
+    """Covers a region with viewport searches, splitting tiles whose feed comes back saturated.
+
+    ``harvest(tile)`` searches one tile and returns its feed entries (dicts with
+    ``href`` and ``name``, as ``GoogleMapsScraper.harvest_places`` returns them).
+    Tiles are searched by ``workers`` threads. A tile yielding ``saturation`` or more
+    places is split into quadrants, down to ``max_depth`` levels. Places are
+    deduplicated across tiles by place ID.
+    """
+
+    def __init__(self, bounds, grid=(4, 4), saturation=DEFAULT_SATURATION, max_depth=4):
+        self.bounds = bounds
+        self.grid = grid
+        self.saturation = saturation
+        self.max_depth = max_depth
+        self.places = {}  # place ID -> place, in discovery order
+        self.tiles = []  # (tile, places returned, saturated) for every tile searched
+        self._lock = threading.Lock()
+
+    def run(self, harvest, workers=4, progress_callback=None, max_places=None):
+        """Search every tile, subdividing as needed; returns the unique places found.
+
+        Stops scheduling new tiles once ``max_places`` unique places have been found.
+        """
+        pending = plan_grid(self.bounds, *self.grid)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            running = {}
+            while pending or running:
+                while pending and len(running) < workers:
+                    tile = pending.pop(0)
+                    running[executor.submit(harvest, tile)] = tile
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tile = running.pop(future)
+                    try:
+                        places = future.result()
+                    except Exception as e:
+                        print(f"Error searching {tile}: {e}")
+                        places = []
+                    new = self._add(tile, places)
+                    saturated = len(places) >= self.saturation
+                    if saturated and tile.depth < self.max_depth:
+                        pending.extend(tile.split())
+                    msg = (f"Tile {len(self.tiles)} (depth {tile.depth}): {len(places)} places, {new} new"
+                           f"{', saturated' if saturated else ''} ({len(self.places)} unique so far)")
+                    print(msg)
+                    if progress_callback:
+                        progress_callback(msg)
+                if max_places and len(self.places) >= max_places:
+                    pending = []
+        return list(self.places.values())
+
+    def _add(self, tile, places):
+        new = 0
+        with self._lock:
+            for place in places:
+                place_id = place_id_from_href(place['href'])
+                if place_id and place_id not in self.places:
+                    self.places[place_id] = place
+                    new += 1
+            self.tiles.append((tile, len(places), len(places) >= self.saturation))
+        return new
+
+    def coverage(self):
+        """How completely the region was searched.
+
+        ``coverage`` is the share of the region's area covered by tiles whose feed was
+        not saturated, i.e. where every place should have been listed. Saturated
+        tiles that could not be split any further count as uncovered.
+        """
+        south, west, north, east = self.bounds
+        region_area = (north - south) * (east - west)
+        saturated = [tile for tile, _, is_saturated in self.tiles if is_saturated]
+        complete_area = sum(tile.area for tile, _, is_saturated in self.tiles if not is_saturated)
+        returned = sum(count for _, count, _ in self.tiles)
+        return {
+            'tiles_searched': len(self.tiles),
+            'tiles_saturated': len(saturated),
+            'saturated_at_max_depth': sum(1 for tile in saturated if tile.depth >= self.max_depth),
+            'max_depth_reached': max((tile.depth for tile, _, _ in self.tiles), default=0),
+            'places_returned': returned,
+            'unique_places': len(self.places),
+            'duplicate_ratio': 1 - len(self.places) / returned if returned else 0.0,
+            'coverage': complete_area / region_area if region_area else 0.0,
+        }
+
+
+def harvest_with_pool(pool, query, max_pages=30, pacing=None):
+    """A ``harvest`` function for TilePlanner that searches each tile on a driver leased from ``pool``."""
+    from scraper.google_maps_scraper import GoogleMapsScraper
+
+    def harvest(tile):
+        driver = pool.lease()
+        scraper = GoogleMapsScraper(driver=driver, pacing=pacing)
+        try:
+            # Scroll until the feed ends so saturation is judged on everything the tile lists
+            return scraper.harvest_places(query, max_pages=max_pages, url=tile.search_url(query, scraper.base_url))
+        finally:
+            pool.release(driver, pages=scraper.pages_loaded)
+
+    return harvest
+
+
+def scrape_region(pool, query, bounds, max_results=None, workers=4, grid=(4, 4), saturation=DEFAULT_SATURATION,
+                  max_depth=4, max_pages=30, progress_callback=None, cache=None, stats=None, pacing=None):
+    """Scrape ``query`` across a whole region: plan and search tiles, then extract the unique places.
+
+    Returns ``(records, coverage)``, with records in discovery order. Tile searches and
+    detail extraction share one ``WaitScheduler``, so ``pacing`` limits their combined rate.
+    """
+    from scraper.pacing import WaitScheduler
+    from scraper.parallel import extract_parallel
+
+    pacing = pacing or WaitScheduler()
+    planner = TilePlanner(bounds, grid, saturation, max_depth)
+    places = planner.run(harvest_with_pool(pool, query, max_pages, pacing), workers, progress_callback)
+    coverage = planner.coverage()
+    print(f"Searched {coverage['tiles_searched']} tiles: {coverage['unique_places']} unique places, "
+          f"{coverage['coverage']:.0%} of the region unsaturated")
+    if progress_callback:
+        progress_callback(f"Found {len(places)} unique places, extracting details...")
+    records = extract_parallel(pool, places, max_results, workers, progress_callback, cache, stats, pacing)
+    return records, coverage
+
+
+def main():
+    from scraper.driver_pool import DriverPool
+    from scraper.sinks import open_sink
+
+    parser = argparse.ArgumentParser(description='Scrape a query across a region by searching a grid of map tiles.')
+    parser.add_argument('query', help='Search query, e.g. "restaurants"')
+    parser.add_argument('--bounds', required=True, type=parse_bounds, help='south,west,north,east in degrees')
+    parser.add_argument('--grid', default='4x4', help='Initial grid as ROWSxCOLS')
+    parser.add_argument('--saturation', type=int, default=DEFAULT_SATURATION,
+                        help='Results at which a tile is split into quadrants')
+    parser.add_argument('--max-depth', type=int, default=4, help='How many times a tile may be split')
+    parser.add_argument('--max-results', type=int, default=None, help='Cap on records written')
+    parser.add_argument('-w', '--workers', type=int, default=4, help='Parallel browsers')
+    parser.add_argument('-o', '--output', default='region_results.csv',
+                        help='File to write; .csv, .jsonl, .parquet or .sqlite3')
+    args = parser.parse_args()
+
+    rows, cols = (int(part) for part in args.grid.lower().split('x'))
+    pool = DriverPool(size=args.workers).start()
+    try:
+        records, coverage = scrape_region(pool, args.query, args.bounds, args.max_results, args.workers,
+                                          (rows, cols), args.saturation, args.max_depth)
+    finally:
+        pool.close()
+    with open_sink(args.output) as sink:
+        sink.write_many(records)
+    print(f"Wrote {len(records)} records to {args.output}")
+    print(coverage)
+
+
+if __name__ == '__main__':
+    main()